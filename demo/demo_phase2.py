@@ -17,16 +17,18 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from rich.console import Console
-from rich.table import Table
 
-from src.services.document_processor import DocumentProcessor
-from src.services.wikipedia_scraper import WikipediaScraper
+from demo_utils import render_kv_table
 
+# Module-level console; services are imported in main()
 console = Console()
 
-
 def main():
     """Demo Phase 2 functionality."""
+    # Deferred so the banner shows before the scraper/splitter stack is imported
+    from src.services.document_processor import DocumentProcessor
+    from src.services.wikipedia_scraper import WikipediaScraper
+
     console.print("\n[bold blue]RAG Wikipedia Chatbot - Phase 2 Demo[/bold blue]\n")
 
     # Test pages of varying complexity
@@ -36,15 +38,24 @@ def main():
         # "Cat",                           # Low complexity
     ]
 
-    for page_title in test_pages:
+    scraper = WikipediaScraper()
+    processor = DocumentProcessor()
+
+    # Step 1: Fetch all pages concurrently; output below stays serial per page
+    console.print("[yellow]Step 1: Fetching Wikipedia pages...[/yellow]")
+    try:
+        pages = scraper.fetch_many(test_pages)
+    except Exception as e:
+        console.print(f"[bold red]Error: {e}[/bold red]")
+        import traceback
+
+        traceback.print_exc()
+        return
+
+    for page_title, page in zip(test_pages, pages):
         console.print(f"\n[bold green]Testing with: {page_title}[/bold green]\n")
 
         try:
-            # Step 1: Fetch Wikipedia page
-            console.print("[yellow]Step 1: Fetching Wikipedia page...[/yellow]")
-            scraper = WikipediaScraper()
-            page = scraper.fetch(page_title)
-
             # Display page info
             console.print(f"✓ Title: {page.title}")
             console.print(f"✓ URL: {page.url}")
@@ -54,7 +65,6 @@ def main():
 
             # Step 2: Process into chunks
             console.print(f"\n[yellow]Step 2: Processing into chunks...[/yellow]")
-            processor = DocumentProcessor()
             chunks = processor.process_page(page)
 
             console.print(f"✓ Created {len(chunks)} chunks")
@@ -62,16 +72,17 @@ def main():
             # Step 3: Display statistics
             stats = processor.get_chunk_stats(chunks)
 
-            table = Table(title="Chunk Statistics", show_header=True)
-            table.add_column("Metric", style="cyan")
-            table.add_column("Value", style="green")
-
-            table.add_row("Total Chunks", str(stats["total_chunks"]))
-            table.add_row("Avg Chunk Size", f"{stats['avg_chunk_size']} chars")
-            table.add_row("Min Chunk Size", f"{stats['min_chunk_size']} chars")
-            table.add_row("Max Chunk Size", f"{stats['max_chunk_size']} chars")
-            table.add_row("Total Tokens", f"{stats['total_tokens']:,}")
-            table.add_row("Avg Tokens/Chunk", str(stats["avg_tokens_per_chunk"]))
+            table = render_kv_table(
+                "Chunk Statistics",
+                [
+                    ("Total Chunks", str(stats["total_chunks"])),
+                    ("Avg Chunk Size", f"{stats['avg_chunk_size']} chars"),
+                    ("Min Chunk Size", f"{stats['min_chunk_size']} chars"),
+                    ("Max Chunk Size", f"{stats['max_chunk_size']} chars"),
+                    ("Total Tokens", f"{stats['total_tokens']:,}"),
+                    ("Avg Tokens/Chunk", str(stats["avg_tokens_per_chunk"])),
+                ],
+            )
 
             console.print(table)
 
@@ -82,11 +93,7 @@ def main():
                 console.print(f"[bold]Chunk {i + 1}[/bold]")
                 console.print(f"  Section: {chunk.section_title or 'Introduction'}")
                 console.print(f"  Tokens: ~{chunk.token_count}")
-                console.print(
-                    f"  Content: {chunk.content[:150]}..."
-                    if len(chunk.content) > 150
-                    else chunk.content
-                )
+                console.print(f"  Content: {chunk.preview(150)}")
                 console.print()
 
             console.print("[bold green]✓ Phase 2 Demo Complete![/bold green]\n")
@@ -16,23 +16,83 @@ Requirements:
 Run: python demo_phase5.py
 """
 
+import asyncio
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
-from rich.table import Table
+from rich.text import Text
 
-from src.services.rag_service import RAGService
+from demo_utils import render_kv_table
 
+if TYPE_CHECKING:
+    from src.models.schemas import DocumentChunk, QueryResult
+
+# Module-level console; heavy services (torch, chromadb) are imported in main()
 console = Console()
 
+_QUIT_COMMANDS = frozenset({"quit", "exit", "q"})
+
+
+def render_answer(result: "QueryResult") -> Group:
+    """Build the answer panel and retrieved-chunks table as one renderable."""
+    parts = [Text("Answer:", style="bold green"), Panel(result.context, border_style="green")]
+
+    if result.retrieved_chunks:
+        parts.append(
+            render_kv_table(
+                "Retrieved Context",
+                [
+                    (f"[{i}] {chunk.section_title or 'Introduction'}", f"{score:.3f}")
+                    for i, (chunk, score) in enumerate(
+                        zip(result.retrieved_chunks, result.similarity_scores), 1
+                    )
+                ],
+                headers=("Section", "Similarity"),
+            )
+        )
+
+    return Group(*parts)
+
+
+def print_question_result(idx: int, question: str, result: "QueryResult") -> None:
+    """Print one scripted question with its answer and retrieved chunks."""
+    console.print(f"\n[bold cyan]Question {idx}:[/bold cyan] {question}")
+    console.print(f"[dim]→ Retrieved {len(result.retrieved_chunks)} relevant chunks[/dim]")
+
+    # Display results
+    console.print()
+    console.print("[bold green]Answer:[/bold green]")
+    console.print(Panel(result.context, border_style="green"))
+
+    # Show retrieved chunks
+    print_retrieved_chunks(list(zip(result.retrieved_chunks, result.similarity_scores)))
+
+
+def print_retrieved_chunks(hits: list[tuple["DocumentChunk", float]]) -> None:
+    """Print retrieved chunks with their similarity scores."""
+    if hits:
+        console.print("\n[bold dim]Retrieved Context:[/bold dim]")
+        for i, (chunk, score) in enumerate(hits, 1):
+            console.print(
+                f"  [{i}] {chunk.section_title or 'Introduction'} "
+                f"(similarity: {score:.3f})"
+            )
+            console.print(f"      {chunk.preview(100)}")
+        console.print()
+
 
 def main():
     """Demo Phase 5: Complete RAG pipeline."""
+    # Deferred so the banner shows before torch/chromadb are imported
+    from src.services.rag_service import RAGService
+
     console.print("\n[bold blue]RAG Wikipedia Chatbot - Phase 5 Demo[/bold blue]")
     console.print("[dim]Complete RAG Pipeline with LMStudio[/dim]\n")
 
@@ -73,16 +133,17 @@ def main():
         page_info = rag_service.load_wikipedia_page(page_title)
 
         # Display page info
-        info_table = Table(title="Page Information", show_header=True)
-        info_table.add_column("Metric", style="cyan")
-        info_table.add_column("Value", style="green")
-
-        info_table.add_row("Title", page_info["title"])
-        info_table.add_row("Word Count", f"{page_info['word_count']:,}")
-        info_table.add_row("Sections", str(page_info["sections"]))
-        info_table.add_row("Chunks Created", str(page_info["chunks"]))
-        info_table.add_row("Collection", page_info["collection"])
-        info_table.add_row("Stored in DB", str(page_info["collection_info"]["count"]))
+        info_table = render_kv_table(
+            "Page Information",
+            [
+                ("Title", page_info["title"]),
+                ("Word Count", f"{page_info['word_count']:,}"),
+                ("Sections", str(page_info["sections"])),
+                ("Chunks Created", str(page_info["chunks"])),
+                ("Collection", page_info["collection"]),
+                ("Stored in DB", str(page_info["collection_info"]["count"])),
+            ],
+        )
 
         console.print()
         console.print(info_table)
@@ -92,59 +153,39 @@ def main():
         console.print()
         console.print(Panel("[bold]Phase 2: RAG Query & Response[/bold]"))
 
-        for idx, question in enumerate(test_questions, 1):
-            console.print(f"\n[bold cyan]Question {idx}:[/bold cyan] {question}")
-            console.print()
-
-            # Query the RAG system
-            console.print("[dim]→ Generating query embedding...[/dim]")
-            console.print("[dim]→ Searching vector database...[/dim]")
-
-            result = rag_service.query(question, k=3, min_similarity=0.3)
-
-            console.print(f"[dim]→ Retrieved {len(result.retrieved_chunks)} relevant chunks[/dim]")
-
-            if llm_available:
-                console.print("[dim]→ Generating LLM response...[/dim]")
-
-            # Display results
-            console.print()
-            console.print("[bold green]Answer:[/bold green]")
-            console.print(Panel(result.context, border_style="green"))
-
-            # Show retrieved chunks
-            if result.retrieved_chunks:
-                console.print("\n[bold dim]Retrieved Context:[/bold dim]")
-                for i, (chunk, score) in enumerate(
-                    zip(result.retrieved_chunks, result.similarity_scores), 1
-                ):
-                    console.print(
-                        f"  [{i}] {chunk.section_title or 'Introduction'} "
-                        f"(similarity: {score:.3f})"
-                    )
-                    console.print(
-                        f"      {chunk.content[:100]}..."
-                        if len(chunk.content) > 100
-                        else chunk.content
-                    )
-                console.print()
+        if llm_available:
+            # Retrieval is batched and the LLM calls run concurrently
+            console.print("\n[dim]→ Asking all questions concurrently...[/dim]")
+            results = asyncio.run(
+                rag_service.aquery_many(test_questions, k=3, min_similarity=0.42)
+            )
+            for idx, (question, result) in enumerate(zip(test_questions, results), 1):
+                print_question_result(idx, question, result)
+        else:
+            # One embedding batch and one vector search for every question
+            console.print("\n[dim]→ Retrieving context for all questions...[/dim]")
+            retrieved = rag_service.retrieve_many(test_questions, k=3, min_similarity=0.42)
+            for idx, (question, hits) in enumerate(zip(test_questions, retrieved), 1):
+                console.print(f"\n[bold cyan]Question {idx}:[/bold cyan] {question}")
+                console.print(f"[dim]→ Retrieved {len(hits)} relevant chunks[/dim]")
+                print_retrieved_chunks(hits)
 
         # ===== Summary =====
         console.print(Panel("[bold green]Phase 5 Demo Complete![/bold green]"))
 
         # Summary table
-        summary_table = Table(title="RAG Pipeline Summary", show_header=True)
-        summary_table.add_column("Component", style="cyan")
-        summary_table.add_column("Status", style="green")
-
-        summary_table.add_row("Wikipedia Scraper", "✓ Working")
-        summary_table.add_row("Document Processor", "✓ Working")
-        summary_table.add_row("Embedding Service", "✓ Working")
-        summary_table.add_row("ChromaDB", "✓ Working")
-        summary_table.add_row(
-            "LMStudio", "✓ Working" if llm_available else "⚠️  Not Available"
+        summary_table = render_kv_table(
+            "RAG Pipeline Summary",
+            [
+                ("Wikipedia Scraper", "✓ Working"),
+                ("Document Processor", "✓ Working"),
+                ("Embedding Service", "✓ Working"),
+                ("ChromaDB", "✓ Working"),
+                ("LMStudio", "✓ Working" if llm_available else "⚠️  Not Available"),
+                ("RAG Pipeline", "✓ Complete"),
+            ],
+            headers=("Component", "Status"),
         )
-        summary_table.add_row("RAG Pipeline", "✓ Complete")
 
         console.print()
         console.print(summary_table)
@@ -159,16 +200,20 @@ def main():
             while True:
                 question = console.input("[bold cyan]Your question[/bold cyan] (or 'quit'): ")
 
-                if question.lower() in ["quit", "exit", "q"]:
+                question = question.strip()
+                if question.lower() in _QUIT_COMMANDS:
                     break
 
-                if not question.strip():
+                if not question:
                     continue
 
                 console.print()
-                result = rag_service.query(question, k=3, min_similarity=0.3)
-                console.print("[bold green]Answer:[/bold green]")
-                console.print(Panel(result.context, border_style="green"))
+                # Single in-place region: the status line is replaced by the final answer
+                with Live(
+                    Text("Thinking...", style="dim"), console=console, auto_refresh=False
+                ) as live:
+                    result = rag_service.query(question, k=3, min_similarity=0.42)
+                    live.update(render_answer(result), refresh=True)
                 console.print()
 
         except (KeyboardInterrupt, EOFError):
@@ -0,0 +1,29 @@
+"""
+Shared rendering helpers for the demo scripts.
+"""
+
+from rich.table import Table
+
+
+def render_kv_table(
+    title: str,
+    rows: list[tuple[str, str]],
+    headers: tuple[str, str] = ("Metric", "Value"),
+) -> Table:
+    """
+    Build a two-column key/value table from a list of rows.
+
+    Args:
+        title: Table title
+        rows: (key, value) pairs, already formatted as strings
+        headers: Column headers for the key and value columns
+
+    Returns:
+        Rich Table ready to print
+    """
+    table = Table(title=title, show_header=True)
+    table.add_column(headers[0], style="cyan")
+    table.add_column(headers[1], style="green")
+    for key, value in rows:
+        table.add_row(key, value)
+    return table
@@ -5,34 +5,131 @@ RAG Wikipedia Chatbot MVP - Main CLI Application
 Interactive command-line interface for the RAG Wikipedia Chatbot.
 """
 
+import argparse
+import asyncio
 import sys
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-import click
+from collections.abc import Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
+from rich.spinner import Spinner
 from rich.table import Table
-from rich.markdown import Markdown
+from rich.text import Text
 
-from src.services.rag_service import RAGService
 from src.adapters.llm_adapter import LLMConnectionError, LLMModelNotFoundError
 from src.services.wikipedia_scraper import PageNotFoundError, NetworkError
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from src.models.schemas import QueryResult
+    from src.services.rag_service import RAGService
+
+# RAGService (torch, chromadb) is imported when services start, so the
+# welcome panel shows before the heavy imports run
 console = Console()
 logger = get_logger(__name__)
 
+WELCOME_TEXT = """
+# RAG Wikipedia Chatbot
+
+Ask questions about any Wikipedia page with AI-powered answers and source citations.
+
+**Commands:**
+- `load <page>` - Load a Wikipedia page
+- `chat` - Enter chat mode
+- `info` - Show current page info
+- `clear` - Clear current page
+- `help` - Show this help
+- `exit` - Quit application
+"""
+
+HELP_TEXT = """
+# Available Commands
+
+## Load a Wikipedia Page
+```
+load <page_title_or_url>
+```
+Load and index a Wikipedia page for Q&A.
+
+**Examples:**
+- `load Python (programming language)`
+- `load https://en.wikipedia.org/wiki/Quantum_mechanics`
+
+## Chat Mode
+```
+chat
+```
+Enter interactive chat mode to ask questions about the loaded page.
+Type `exit` to leave chat mode.
+
+## Information
+```
+info
+```
+Show information about the currently loaded page.
+
+## Clear Page
+```
+clear
+```
+Remove the currently loaded page from the index.
+
+## Help
+```
+help
+```
+Show this help message.
+
+## Exit
+```
+exit
+```
+Quit the application.
+"""
+
+
+@lru_cache(maxsize=None)
+def _markdown_panel(text: str, title: str) -> Panel:
+    """Render a Markdown panel once; Markdown (and Pygments) load on first use."""
+    from rich.markdown import Markdown
+
+    return Panel(Markdown(text), title=title, border_style="blue")
+
+
+def _answer_panel(text: str) -> Panel:
+    """Panel used for assistant answers in chat mode."""
+    return Panel(text, border_style="green", padding=(1, 2))
+
 
 class ChatbotCLI:
     """Command-line interface for the RAG Wikipedia Chatbot."""
 
     def __init__(self):
         """Initialize the chatbot CLI."""
-        self.rag_service: RAGService = None
+        self.rag_service: "RAGService" = None
         self.running = True
+        self._answer_live: Live = None  # Reused chat-mode answer display
+        self._loop: asyncio.AbstractEventLoop = None  # Chat-mode event loop
+
+        # Command name -> handler taking the rest of the input line
+        self._handlers: dict[str, Callable[[str], None]] = {
+            "load": self._cmd_load,
+            "chat": lambda _: self._cmd_chat(),
+            "info": lambda _: self._cmd_info(),
+            "clear": lambda _: self._cmd_clear(),
+            "help": lambda _: self._cmd_help(),
+        }
+        for alias in ("exit", "quit", "q"):
+            self._handlers[alias] = lambda _: self._cmd_exit()
 
     def start(self):
         """Start the chatbot CLI."""
@@ -45,20 +142,7 @@ class ChatbotCLI:
     def _print_welcome(self):
         """Print welcome message."""
         console.print()
-        welcome_text = """
-# RAG Wikipedia Chatbot
-
-Ask questions about any Wikipedia page with AI-powered answers and source citations.
-
-**Commands:**
-- `load <page>` - Load a Wikipedia page
-- `chat` - Enter chat mode
-- `info` - Show current page info
-- `clear` - Clear current page
-- `help` - Show this help
-- `exit` - Quit application
-        """
-        console.print(Panel(Markdown(welcome_text), title="Welcome", border_style="blue"))
+        console.print(_markdown_panel(WELCOME_TEXT, "Welcome"))
 
     def _initialize_service(self):
         """Initialize the RAG service."""
@@ -66,6 +150,8 @@ Ask questions about any Wikipedia page with AI-powered answers and source citati
             console.print("\n[yellow]Initializing services...[/yellow]")
 
             with console.status("[bold green]Loading..."):
+                from src.services.rag_service import RAGService
+
                 self.rag_service = RAGService()
 
             console.print("[green]✓ Services initialized[/green]")
@@ -111,18 +197,9 @@ Ask questions about any Wikipedia page with AI-powered answers and source citati
                 args = parts[1] if len(parts) > 1 else ""
 
                 # Execute command
-                if cmd == "load":
-                    self._cmd_load(args)
-                elif cmd == "chat":
-                    self._cmd_chat()
-                elif cmd == "info":
-                    self._cmd_info()
-                elif cmd == "clear":
-                    self._cmd_clear()
-                elif cmd == "help":
-                    self._cmd_help()
-                elif cmd in ["exit", "quit", "q"]:
-                    self._cmd_exit()
+                handler = self._handlers.get(cmd)
+                if handler is not None:
+                    handler(args)
                 else:
                     console.print(f"[red]Unknown command: {cmd}[/red]")
                     console.print("Type [cyan]help[/cyan] for available commands.")
@@ -194,24 +271,15 @@ Ask questions about any Wikipedia page with AI-powered answers and source citati
                     console.print("[yellow]Exiting chat mode[/yellow]\n")
                     break
 
-                # Query the RAG system
-                with console.status("[bold green]Thinking..."):
-                    result = self.rag_service.query(
-                        question=question,
-                        k=5,
-                        min_similarity=0.3,
-                        include_context=True,
-                    )
-
-                # Display response
+                # Query the RAG system and display the response as it streams
                 console.print("\n[bold green]Assistant:[/bold green]")
-                console.print(Panel(result.context, border_style="green", padding=(1, 2)))
+                result = self._stream_answer(question)
 
                 # Show source chunks (optional, compact view)
                 if result.retrieved_chunks:
                     console.print(
                         f"[dim]Retrieved {len(result.retrieved_chunks)} relevant sections "
-                        f"(avg similarity: {sum(result.similarity_scores) / len(result.similarity_scores):.2f})[/dim]"
+                        f"(avg similarity: {result.avg_similarity:.2f})[/dim]"
                     )
 
                 console.print()
@@ -229,6 +297,58 @@ Ask questions about any Wikipedia page with AI-powered answers and source citati
                 console.print(f"[red]Error: {e}[/red]\n")
                 logger.error(f"Chat error: {e}", exc_info=True)
 
+    def _run_async(self, coroutine):
+        """Run a coroutine on the CLI's event loop.
+
+        One loop is kept for the whole session (instead of asyncio.run per
+        question) so the async LLM client can keep its connections open.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+
+    def _stream_answer(self, question: str) -> "QueryResult":
+        """Answer a question, redrawing the answer panel as tokens arrive.
+
+        One Live display is created lazily and restarted for every question,
+        starting as a "Thinking..." spinner. When the console is not a
+        terminal the answer is printed once it is complete.
+        """
+        if not console.is_terminal:
+            result = self._run_async(
+                self.rag_service.aquery(question=question, k=5, min_similarity=0.42)
+            )
+            console.print(_answer_panel(result.context))
+            return result
+
+        if self._answer_live is None:
+            self._answer_live = Live(console=console, refresh_per_second=12)
+        live = self._answer_live
+        streamed: list[str] = []
+
+        def on_token(delta: str) -> None:
+            streamed.append(delta)
+            live.update(_answer_panel("".join(streamed)))
+
+        live.update(Spinner("dots", text=Text("Thinking...", style="bold green")))
+        live.start()
+        try:
+            result = self._run_async(
+                self.rag_service.aquery(
+                    question=question,
+                    k=5,
+                    min_similarity=0.42,
+                    include_context=True,
+                    on_token=on_token,
+                )
+            )
+            # Final render adds the citations
+            live.update(_answer_panel(result.context))
+        finally:
+            live.stop()
+
+        return result
+
     def _cmd_info(self):
         """Show information about current page."""
         info = self.rag_service.get_current_page_info()
@@ -269,51 +389,7 @@ Ask questions about any Wikipedia page with AI-powered answers and source citati
 
     def _cmd_help(self):
         """Show help information."""
-        help_text = """
-# Available Commands
-
-## Load a Wikipedia Page
-```
-load <page_title_or_url>
-```
-Load and index a Wikipedia page for Q&A.
-
-**Examples:**
-- `load Python (programming language)`
-- `load https://en.wikipedia.org/wiki/Quantum_mechanics`
-
-## Chat Mode
-```
-chat
-```
-Enter interactive chat mode to ask questions about the loaded page.
-Type `exit` to leave chat mode.
-
-## Information
-```
-info
-```
-Show information about the currently loaded page.
-
-## Clear Page
-```
-clear
-```
-Remove the currently loaded page from the index.
-
-## Help
-```
-help
-```
-Show this help message.
-
-## Exit
-```
-exit
-```
-Quit the application.
-        """
-        console.print(Panel(Markdown(help_text), title="Help", border_style="blue"))
+        console.print(_markdown_panel(HELP_TEXT, "Help"))
 
     def _cmd_exit(self):
         """Exit the application."""
@@ -323,27 +399,42 @@ Quit the application.
             # Clear current page if any
             if self.rag_service.current_page_title:
                 self.rag_service.clear_current_page()
+            # Save cached answers still buffered in memory
+            self.rag_service.vector_db.flush()
         except Exception as e:
             logger.error(f"Cleanup error: {e}", exc_info=True)
 
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
         console.print("[green]Thanks for using RAG Wikipedia Chatbot![/green]")
         console.print("[dim]Goodbye! 👋[/dim]\n")
         self.running = False
 
 
-@click.command()
-@click.option("--load", "-l", help="Load a Wikipedia page on startup")
-@click.option("--debug", is_flag=True, help="Enable debug logging")
-def main(load: str = None, debug: bool = False):
+def main(argv: Optional[list[str]] = None):
     """
     RAG Wikipedia Chatbot - Ask questions about Wikipedia pages with AI.
 
-    \b
-    Examples:
-        python main.py
-        python main.py --load "Albert Einstein"
-        python main.py --debug
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
     """
+    parser = argparse.ArgumentParser(
+        description="RAG Wikipedia Chatbot - Ask questions about Wikipedia pages with AI.",
+        epilog=(
+            "Examples:\n"
+            "  python main.py\n"
+            '  python main.py --load "Albert Einstein"\n'
+            "  python main.py --debug"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--load", "-l", help="Load a Wikipedia page on startup")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args(argv)
+    load, debug = args.load, args.debug
+
     # Set debug level if requested
     if debug:
         import logging
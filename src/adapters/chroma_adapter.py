@@ -4,29 +4,52 @@ ChromaDB adapter implementation.
 Implements the VectorDBAdapter interface for ChromaDB.
 """
 
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from src.adapters.vectordb_adapter import (
     CollectionNotFoundError,
+    Embedding,
+    Embeddings,
     SearchError,
     StorageError,
     VectorDBAdapter,
 )
-from src.models.schemas import DocumentChunk
+from src.models.schemas import DocumentChunk, SearchResult
 from src.utils.config import get_settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _chroma_client_settings() -> Settings:
+    """ChromaDB client settings, built once and shared by every adapter."""
+    settings = get_settings()
+    # The client keeps one pooled keep-alive httpx session for all calls;
+    # size the pool so bursts of add/query requests reuse connections
+    return Settings(
+        anonymized_telemetry=False,
+        chroma_http_max_connections=settings.chroma_http_max_connections,
+        chroma_http_max_keepalive_connections=settings.chroma_http_max_keepalive_connections,
+    )
+
+
 class ChromaAdapter(VectorDBAdapter):
     """
     ChromaDB implementation of the VectorDBAdapter.
 
     Provides persistent storage and similarity search using ChromaDB.
+
+    Collections are created with cosine distance by default, and search
+    scores are reported as similarities in [0-1] using the distance metric
+    recorded on each collection (so older L2 collections still score
+    correctly).
     """
 
     def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
@@ -40,18 +63,24 @@ class ChromaAdapter(VectorDBAdapter):
         settings = get_settings()
         self.host = host or settings.chroma_host
         self.port = port or settings.chroma_port
-        self.client = chromadb.HttpClient(
-            host=self.host,
-            port=self.port,
-            settings=Settings(anonymized_telemetry=False),
-        )
+        self.client = None
         self.collections: dict = {}
 
+        # Connect once here so no method has to check for a missing client
+        self.initialize()
+
         logger.info(f"ChromaDB adapter initialized (host={self.host}, port={self.port})")
 
     def initialize(self) -> None:
-        """Initialize connection to ChromaDB."""
+        """Create the ChromaDB client (if needed) and check the connection."""
         try:
+            if self.client is None:
+                self.client = chromadb.HttpClient(
+                    host=self.host,
+                    port=self.port,
+                    settings=_chroma_client_settings(),
+                )
+
             # Test connection
             self.client.heartbeat()
 
@@ -66,7 +95,8 @@ class ChromaAdapter(VectorDBAdapter):
 
         Args:
             collection_name: Name of the collection
-            **kwargs: Additional parameters (metadata, distance_function, etc.)
+            **kwargs: Additional parameters (metadata, space: distance metric
+                "cosine" (default), "ip" or "l2")
         """
         try:
             # Check if collection already exists
@@ -74,13 +104,11 @@ class ChromaAdapter(VectorDBAdapter):
                 logger.warning(f"Collection '{collection_name}' already exists")
                 return
 
-            # Create collection with metadata
-            metadata = kwargs.get("metadata", {})
-            metadata["created_by"] = "rag-chatbot"
-
             collection = self.client.create_collection(
                 name=collection_name,
-                metadata=metadata,
+                metadata=self._collection_metadata(
+                    kwargs.get("metadata"), kwargs.get("space", "cosine")
+                ),
             )
 
             self.collections[collection_name] = collection
@@ -91,6 +119,38 @@ class ChromaAdapter(VectorDBAdapter):
             logger.error(f"Failed to create collection '{collection_name}': {e}", exc_info=True)
             raise StorageError(f"Failed to create collection: {e}") from e
 
+    def _ensure_collection(self, collection_name: str, metadata: Optional[dict] = None):
+        """
+        Get a collection, creating it if missing, in one server round trip.
+
+        Uses get_or_create_collection instead of an exists-check followed by
+        create/get, which also avoids racing another writer in between.
+        """
+        if collection_name in self.collections:
+            return self.collections[collection_name]
+
+        collection = self.client.get_or_create_collection(
+            name=collection_name,
+            metadata=self._collection_metadata(metadata, "cosine"),
+        )
+        self.collections[collection_name] = collection
+        return collection
+
+    @staticmethod
+    def _collection_metadata(metadata: Optional[dict], space: str) -> dict:
+        """Metadata for a new collection: caller's values plus index defaults."""
+        metadata = dict(metadata or {})
+        metadata["created_by"] = "rag-chatbot"
+        metadata.setdefault("hnsw:space", space)
+
+        # HNSW index tuning (recall vs. build/search latency)
+        settings = get_settings()
+        metadata.setdefault("hnsw:M", settings.chroma_hnsw_m)
+        metadata.setdefault("hnsw:construction_ef", settings.chroma_hnsw_construction_ef)
+        metadata.setdefault("hnsw:search_ef", settings.chroma_hnsw_search_ef)
+
+        return metadata
+
     def delete_collection(self, collection_name: str) -> None:
         """
         Delete a collection from ChromaDB.
@@ -148,15 +208,25 @@ class ChromaAdapter(VectorDBAdapter):
         self,
         collection_name: str,
         chunks: list[DocumentChunk],
-        embeddings: list[list[float]],
+        embeddings: Embeddings,
+        batch_size: Optional[int] = None,
+        on_batch_processed: Optional[Callable[[int], None]] = None,
     ) -> None:
         """
         Store document chunks with embeddings in ChromaDB.
 
+        Each batch is written with a single ``collection.add`` call (one
+        HTTP round trip per batch rather than one per document).
+
         Args:
             collection_name: Name of the collection
             chunks: List of DocumentChunk objects
-            embeddings: List of embedding vectors
+            embeddings: 2-D array or list of embedding vectors; coerced once
+                to a contiguous float32 array (a no-op for float32 arrays)
+            batch_size: Number of chunks per ``add`` call
+                (default: ``chroma_batch_size`` from settings)
+            on_batch_processed: Optional callback invoked with the number of
+                chunks written after each batch (e.g. to advance a progress bar)
         """
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
@@ -165,22 +235,23 @@ class ChromaAdapter(VectorDBAdapter):
             logger.warning("No chunks to store")
             return
 
+        if batch_size is None:
+            batch_size = get_settings().chroma_batch_size
+
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
         try:
             # Create collection if it doesn't exist
-            if not self.collection_exists(collection_name):
-                self.create_collection(collection_name)
-
-            collection = self._get_collection(collection_name)
+            collection = self._ensure_collection(collection_name)
 
             # Prepare data for ChromaDB
             ids = [chunk.chunk_id for chunk in chunks]
             documents = [chunk.content for chunk in chunks]
             metadatas = [chunk.metadata for chunk in chunks]
 
-            # Store in batches to avoid memory issues
-            batch_size = 100
-            for i in range(0, len(chunks), batch_size):
-                batch_end = min(i + batch_size, len(chunks))
+            total = len(chunks)
+            for i in range(0, total, batch_size):
+                batch_end = min(i + batch_size, total)
 
                 collection.add(
                     ids=ids[i:batch_end],
@@ -189,7 +260,8 @@ class ChromaAdapter(VectorDBAdapter):
                     metadatas=metadatas[i:batch_end],
                 )
 
-                logger.debug(f"Stored batch {i // batch_size + 1}: " f"{batch_end - i} chunks in '{collection_name}'")
+                if on_batch_processed is not None:
+                    on_batch_processed(batch_end - i)
 
             logger.info(f"Stored {len(chunks)} chunks in collection '{collection_name}'")
 
@@ -200,7 +272,7 @@ class ChromaAdapter(VectorDBAdapter):
     def similarity_search(
         self,
         collection_name: str,
-        query_embedding: list[float],
+        query_embedding: Embedding,
         k: int = 5,
         filter_metadata: Optional[dict] = None,
     ) -> list[tuple[DocumentChunk, float]]:
@@ -216,54 +288,198 @@ class ChromaAdapter(VectorDBAdapter):
         Returns:
             List of (DocumentChunk, similarity_score) tuples
         """
+        try:
+            results = self._query(collection_name, query_embedding, k, filter_metadata)
+
+            search_results = []
+            if results["ids"] and len(results["ids"]) > 0:
+                search_results = self._row_to_chunks(
+                    results, 0, self._distance_space(collection_name)
+                )
+
+            logger.info(f"Found {len(search_results)} results in collection '{collection_name}'")
+
+            return search_results
+
+        except CollectionNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Search failed: {e}", exc_info=True)
+            raise SearchError(f"Search failed: {e}") from e
+
+    def similarity_search_many(
+        self,
+        collection_name: str,
+        query_embeddings: Embeddings,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """
+        Search for several queries with a single ChromaDB request.
+
+        All query vectors go to the server in one ``collection.query`` call,
+        replacing one HTTP round trip per question with one per batch.
+
+        Args:
+            collection_name: Name of the collection
+            query_embeddings: Query vectors (list of lists or a 2-D array)
+            k: Number of results per query
+            filter_metadata: Optional metadata filters (applied to every query)
+
+        Returns:
+            One list of (DocumentChunk, similarity_score) tuples per query,
+            in query order
+        """
+        if len(query_embeddings) == 0:
+            return []
+
         try:
             collection = self._get_collection(collection_name)
 
-            # Perform similarity search
             results = collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=np.asarray(query_embeddings, dtype=np.float32),
                 n_results=k,
                 where=filter_metadata,
                 include=["documents", "metadatas", "distances"],
             )
 
-            # Convert results to DocumentChunk objects
-            search_results = []
+            space = self._distance_space(collection_name)
+            search_results = [
+                self._row_to_chunks(results, q, space) for q in range(len(results["ids"]))
+            ]
 
-            if results["ids"] and len(results["ids"]) > 0:
-                for idx in range(len(results["ids"][0])):
-                    chunk_id = results["ids"][0][idx]
-                    content = results["documents"][0][idx]
-                    metadata = results["metadatas"][0][idx]
-                    distance = results["distances"][0][idx]
-
-                    # Convert distance to similarity score (lower distance = higher similarity)
-                    # ChromaDB uses L2 distance, convert to similarity [0-1]
-                    similarity = 1.0 / (1.0 + distance)
-
-                    # Reconstruct DocumentChunk
-                    chunk = DocumentChunk(
-                        chunk_id=chunk_id,
-                        content=content,
-                        metadata=metadata,
-                        source_page_title=metadata.get("page_title", ""),
-                        source_url=metadata.get("page_url", ""),
-                        section_title=metadata.get("section"),
-                        chunk_index=int(metadata.get("chunk_index", 0)),
-                    )
-
-                    search_results.append((chunk, similarity))
-
-            logger.info(f"Found {len(search_results)} results in collection '{collection_name}'")
+            logger.info(
+                f"Ran {len(search_results)} queries in one batch against '{collection_name}'"
+            )
 
             return search_results
 
+        except CollectionNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Batched search failed: {e}", exc_info=True)
+            raise SearchError(f"Batched search failed: {e}") from e
+
+    def _row_to_chunks(
+        self, results: dict, row: int, space: str
+    ) -> list[tuple[DocumentChunk, float]]:
+        """Rebuild (DocumentChunk, similarity) pairs for one query row of a response."""
+        return list(self._row_to_columns(results, row, space))
+
+    def _row_to_columns(self, results: dict, row: int, space: str) -> SearchResult:
+        """Wrap one query row of a response as a column-oriented SearchResult."""
+        metadatas = results["metadatas"][row]
+
+        return SearchResult(
+            ids=results["ids"][row],
+            scores=self._distances_to_similarities(results["distances"][row], space),
+            contents=results["documents"][row],
+            section_titles=[metadata.get("section") for metadata in metadatas],
+            metadatas=metadatas,
+        )
+
+    def similarity_search_columns(
+        self,
+        collection_name: str,
+        query_embedding: Embedding,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> SearchResult:
+        """
+        Search for similar documents, returning ChromaDB's columns directly.
+
+        Args:
+            collection_name: Name of the collection
+            query_embedding: Query vector
+            k: Number of results
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            SearchResult with parallel id/score/content/section columns
+        """
+        try:
+            results = self._query(collection_name, query_embedding, k, filter_metadata)
+
+            if not results["ids"]:
+                return SearchResult()
+
+            search_result = self._row_to_columns(
+                results, 0, self._distance_space(collection_name)
+            )
+
+            logger.info(f"Found {len(search_result)} results in collection '{collection_name}'")
+
+            return search_result
+
         except CollectionNotFoundError:
             raise
         except Exception as e:
             logger.error(f"Search failed: {e}", exc_info=True)
             raise SearchError(f"Search failed: {e}") from e
 
+    def warmup(self, collection_name: str, dimension: int) -> None:
+        """
+        Prime a collection's HNSW index with one throwaway query.
+
+        The first search after a bulk load pays the index load/page-in cost;
+        running it here keeps that spike off the first real user query.
+        Failures are logged and ignored.
+
+        Args:
+            collection_name: Name of the collection
+            dimension: Embedding dimension of the collection
+        """
+        probe = np.random.default_rng().standard_normal(dimension).astype(np.float32)
+        probe /= np.linalg.norm(probe)
+
+        try:
+            self._query(collection_name, probe, 1, None)
+            logger.debug(f"Warmed up collection '{collection_name}'")
+        except Exception as e:
+            logger.warning(f"Warmup query failed for '{collection_name}': {e}")
+
+    def _distance_space(self, collection_name: str) -> str:
+        """Distance metric of a collection (ChromaDB defaults to L2)."""
+        metadata = self._get_collection(collection_name).metadata or {}
+        return metadata.get("hnsw:space", "l2")
+
+    @staticmethod
+    def _distances_to_similarities(distances: list[float], space: str) -> np.ndarray:
+        """
+        Convert ChromaDB distances to [0-1] similarity scores.
+
+        Lower distance means higher similarity. Cosine distance lies in
+        [0, 2] and maps linearly to ``1 - distance / 2``. Inner product
+        distance is ``1 - dot``, so it maps to ``(1 + dot) / 2`` like the
+        FAISS adapter, clipped to [0, 1] for unnormalized vectors. L2 has
+        no upper bound and keeps the ``1 / (1 + distance)`` mapping.
+        Computed for the whole result row at once.
+        """
+        distances = np.asarray(distances, dtype=np.float32)
+
+        if space == "cosine":
+            return 1.0 - distances / 2.0
+        if space == "ip":
+            return np.clip(1.0 - distances / 2.0, 0.0, 1.0)
+        return 1.0 / (1.0 + distances)
+
+    def _query(
+        self,
+        collection_name: str,
+        query_embedding: Embedding,
+        k: int,
+        filter_metadata: Optional[dict],
+    ) -> dict:
+        """Run a single-query ChromaDB search and return the raw columnar response."""
+        collection = self._get_collection(collection_name)
+
+        return collection.query(
+            query_embeddings=np.asarray(query_embedding, dtype=np.float32).reshape(1, -1),
+            n_results=k,
+            where=filter_metadata,
+            include=["documents", "metadatas", "distances"],
+        )
+
     def get_collection_info(self, collection_name: str) -> dict:
         """
         Get information about a collection.
@@ -300,16 +516,19 @@ class ChromaAdapter(VectorDBAdapter):
         try:
             # ChromaDB doesn't have a direct clear method
             # So we delete and recreate the collection
-            if self.collection_exists(collection_name):
-                # Get metadata before deleting
-                info = self.get_collection_info(collection_name)
-                metadata = info.get("metadata", {})
+            try:
+                collection = self._get_collection(collection_name)
+            except CollectionNotFoundError:
+                return
+
+            # Get metadata before deleting
+            metadata = collection.metadata or {}
 
-                # Delete and recreate
-                self.delete_collection(collection_name)
-                self.create_collection(collection_name, metadata=metadata)
+            # Delete and recreate
+            self.delete_collection(collection_name)
+            self._ensure_collection(collection_name, metadata=metadata)
 
-                logger.info(f"Cleared collection: {collection_name}")
+            logger.info(f"Cleared collection: {collection_name}")
 
         except Exception as e:
             logger.error(f"Failed to clear collection: {e}", exc_info=True)
@@ -323,6 +542,4 @@ def get_chroma_adapter() -> ChromaAdapter:
     Returns:
         Initialized ChromaAdapter
     """
-    adapter = ChromaAdapter()
-    adapter.initialize()
-    return adapter
+    return ChromaAdapter()
@@ -0,0 +1,422 @@
+"""
+FAISS adapter implementation.
+
+Implements the VectorDBAdapter interface with in-process FAISS HNSW indexes,
+avoiding a network round trip per query. Requires the optional ``faiss-cpu``
+package (``pip install rag-wikipedia-chatbot[faiss]``).
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.adapters.vectordb_adapter import (
+    CollectionNotFoundError,
+    Embedding,
+    Embeddings,
+    SearchError,
+    StorageError,
+    VectorDBAdapter,
+)
+from src.models.schemas import DocumentChunk
+from src.utils.config import get_settings
+from src.utils.logger import get_logger
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - optional dependency
+    faiss = None
+
+logger = get_logger(__name__)
+
+
+class _FaissCollection:
+    """One collection: an HNSW index plus the documents for its row ids."""
+
+    def __init__(self, index, metadata: dict):
+        self.index = index
+        self.metadata = metadata
+        self.ids: list[str] = []
+        self.documents: list[str] = []
+        self.metadatas: list[dict] = []
+
+
+class FaissAdapter(VectorDBAdapter):
+    """
+    FAISS implementation of the VectorDBAdapter.
+
+    Each collection is an ``IndexHNSWFlat`` over inner products of
+    L2-normalized vectors (i.e. cosine similarity), kept in memory and
+    saved under ``persist_dir`` on flush() or close(). Scores use the same
+    [0-1] scale as ChromaAdapter's cosine collections, ``(1 + cos) / 2``,
+    so similarity thresholds carry over between adapters.
+    """
+
+    def __init__(self, persist_dir: Optional[str] = None):
+        """
+        Initialize FAISS adapter.
+
+        Args:
+            persist_dir: Directory for saved indexes (default: from settings)
+        """
+        if faiss is None:
+            raise StorageError(
+                "FAISS is not installed. Install it with: pip install faiss-cpu"
+            )
+
+        settings = get_settings()
+        self.persist_dir = Path(persist_dir or settings.faiss_persist_dir)
+        self.hnsw_m = settings.faiss_hnsw_m
+        self.hnsw_construction_ef = settings.faiss_hnsw_construction_ef
+        self.hnsw_search_ef = settings.faiss_hnsw_search_ef
+        self.collections: dict[str, _FaissCollection] = {}
+        # Collections with writes not yet saved to persist_dir
+        self._unsaved: set[str] = set()
+
+        self.initialize()
+
+        logger.info(f"FAISS adapter initialized (persist_dir={self.persist_dir})")
+
+    def initialize(self) -> None:
+        """Create the persistence directory."""
+        try:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise StorageError(f"Failed to create FAISS directory: {e}") from e
+
+    def create_collection(self, collection_name: str, **kwargs) -> None:
+        """
+        Create a new (empty) collection.
+
+        The index itself is built on the first store_documents call, once
+        the embedding dimension is known.
+
+        Args:
+            collection_name: Name of the collection
+            **kwargs: Additional parameters (metadata)
+        """
+        if self.collection_exists(collection_name):
+            logger.warning(f"Collection '{collection_name}' already exists")
+            return
+
+        metadata = dict(kwargs.get("metadata") or {})
+        metadata["created_by"] = "rag-chatbot"
+
+        self.collections[collection_name] = _FaissCollection(None, metadata)
+        logger.info(f"Created collection: {collection_name}")
+
+    def delete_collection(self, collection_name: str) -> None:
+        """
+        Delete a collection and its saved files.
+
+        Args:
+            collection_name: Name of the collection to delete
+        """
+        self.collections.pop(collection_name, None)
+        self._unsaved.discard(collection_name)
+
+        for path in self._paths(collection_name):
+            path.unlink(missing_ok=True)
+
+        logger.info(f"Deleted collection: {collection_name}")
+
+    def collection_exists(self, collection_name: str) -> bool:
+        """
+        Check if a collection exists in memory or on disk.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            True if exists, False otherwise
+        """
+        if collection_name in self.collections:
+            return True
+        return self._paths(collection_name)[1].exists()
+
+    def store_documents(
+        self,
+        collection_name: str,
+        chunks: list[DocumentChunk],
+        embeddings: Embeddings,
+        batch_size: Optional[int] = None,
+        on_batch_processed: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        Add document chunks with embeddings to a collection's index.
+
+        Args:
+            collection_name: Name of the collection
+            chunks: List of DocumentChunk objects
+            embeddings: List of embedding vectors or a 2-D array
+            batch_size: Unused; all chunks are added in one call
+            on_batch_processed: Optional callback invoked once with the number
+                of chunks written
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError("Number of chunks must match number of embeddings")
+
+        if not chunks:
+            logger.warning("No chunks to store")
+            return
+
+        try:
+            if not self.collection_exists(collection_name):
+                self.create_collection(collection_name)
+
+            collection = self._get_collection(collection_name)
+            vectors = self._normalized(embeddings)
+
+            if collection.index is None:
+                collection.index = self._new_index(vectors.shape[1])
+
+            collection.index.add(vectors)
+            collection.ids.extend(chunk.chunk_id for chunk in chunks)
+            collection.documents.extend(chunk.content for chunk in chunks)
+            collection.metadatas.extend(chunk.metadata for chunk in chunks)
+
+            self._unsaved.add(collection_name)
+
+            if on_batch_processed is not None:
+                on_batch_processed(len(chunks))
+
+            logger.info(f"Stored {len(chunks)} chunks in collection '{collection_name}'")
+
+        except Exception as e:
+            logger.error(f"Failed to store documents: {e}", exc_info=True)
+            raise StorageError(f"Failed to store documents: {e}") from e
+
+    def flush(self, collection_name: Optional[str] = None) -> None:
+        """
+        Save collections with unsaved writes to persist_dir.
+
+        Args:
+            collection_name: Collection to save (default: all with unsaved writes)
+        """
+        names = [collection_name] if collection_name is not None else list(self._unsaved)
+
+        for name in names:
+            if name not in self._unsaved:
+                continue
+            try:
+                self._save(name, self.collections[name])
+            except Exception as e:
+                raise StorageError(f"Failed to save collection '{name}': {e}") from e
+            self._unsaved.discard(name)
+
+    def close(self) -> None:
+        """Save any unsaved writes."""
+        self.flush()
+
+    def similarity_search(
+        self,
+        collection_name: str,
+        query_embedding: Embedding,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> list[tuple[DocumentChunk, float]]:
+        """
+        Search for similar documents in a collection.
+
+        Args:
+            collection_name: Name of the collection
+            query_embedding: Query vector
+            k: Number of results
+            filter_metadata: Optional metadata filters (exact match on every key)
+
+        Returns:
+            List of (DocumentChunk, similarity_score) tuples
+        """
+        return self.similarity_search_many(
+            collection_name, [query_embedding], k, filter_metadata
+        )[0]
+
+    def similarity_search_many(
+        self,
+        collection_name: str,
+        query_embeddings: Embeddings,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """
+        Search for several queries with one FAISS call.
+
+        With a metadata filter every stored vector is ranked and the filter
+        is applied afterwards, which is fine at single-page collection sizes.
+
+        Args:
+            collection_name: Name of the collection
+            query_embeddings: Query vectors (list of lists or a 2-D array)
+            k: Number of results per query
+            filter_metadata: Optional metadata filters (exact match on every key)
+
+        Returns:
+            One list of (DocumentChunk, similarity_score) tuples per query
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        collection = self._get_collection(collection_name)
+        if collection.index is None or collection.index.ntotal == 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        try:
+            fetch = collection.index.ntotal if filter_metadata else min(k, collection.index.ntotal)
+            inner_products, rows = collection.index.search(
+                self._normalized(query_embeddings), fetch
+            )
+
+            # Same [0-1] scale as a Chroma cosine collection: 1 - (1 - cos) / 2
+            similarities = (1.0 + inner_products) / 2.0
+
+            search_results = []
+            for query_rows, query_sims in zip(rows, similarities.tolist()):
+                hits = []
+                for row, similarity in zip(query_rows.tolist(), query_sims):
+                    if row < 0:
+                        continue
+                    metadata = collection.metadatas[row]
+                    if filter_metadata and any(
+                        metadata.get(key) != value for key, value in filter_metadata.items()
+                    ):
+                        continue
+                    hits.append((self._chunk(collection, row), similarity))
+                    if len(hits) == k:
+                        break
+                search_results.append(hits)
+
+            logger.info(f"Ran {len(search_results)} queries against '{collection_name}'")
+
+            return search_results
+
+        except Exception as e:
+            logger.error(f"Search failed: {e}", exc_info=True)
+            raise SearchError(f"Search failed: {e}") from e
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        """
+        Get information about a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Dictionary with collection info
+        """
+        collection = self._get_collection(collection_name)
+
+        return {
+            "name": collection_name,
+            "count": len(collection.ids),
+            "metadata": collection.metadata,
+        }
+
+    def clear_collection(self, collection_name: str) -> None:
+        """
+        Clear all documents from a collection, keeping its metadata.
+
+        Args:
+            collection_name: Name of the collection
+        """
+        if not self.collection_exists(collection_name):
+            return
+
+        metadata = self._get_collection(collection_name).metadata
+        self.delete_collection(collection_name)
+        self.create_collection(collection_name, metadata=metadata)
+
+        logger.info(f"Cleared collection: {collection_name}")
+
+    def _new_index(self, dimension: int):
+        """Build an empty HNSW index over inner products."""
+        index = faiss.IndexHNSWFlat(dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self.hnsw_construction_ef
+        index.hnsw.efSearch = self.hnsw_search_ef
+        return index
+
+    @staticmethod
+    def _normalized(vectors) -> np.ndarray:
+        """Contiguous float32 copy of vectors scaled to unit length."""
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    @staticmethod
+    def _chunk(collection: _FaissCollection, row: int) -> DocumentChunk:
+        """Rebuild the DocumentChunk stored at an index row."""
+        metadata = collection.metadatas[row]
+        get = metadata.get
+        return DocumentChunk.model_construct(
+            chunk_id=collection.ids[row],
+            content=collection.documents[row],
+            metadata=metadata,
+            source_page_title=get("page_title", ""),
+            source_url=get("page_url", ""),
+            section_title=get("section"),
+            chunk_index=int(get("chunk_index", 0)),
+        )
+
+    def _get_collection(self, collection_name: str) -> _FaissCollection:
+        """Get a collection from memory, loading it from disk if needed."""
+        if collection_name in self.collections:
+            return self.collections[collection_name]
+
+        index_path, data_path = self._paths(collection_name)
+        if not data_path.exists():
+            raise CollectionNotFoundError(f"Collection '{collection_name}' not found")
+
+        try:
+            data = json.loads(data_path.read_text(encoding="utf-8"))
+            index = faiss.read_index(str(index_path)) if index_path.exists() else None
+            if index is not None:
+                index.hnsw.efSearch = self.hnsw_search_ef
+
+            collection = _FaissCollection(index, data["metadata"])
+            collection.ids = data["ids"]
+            collection.documents = data["documents"]
+            collection.metadatas = data["metadatas"]
+
+        except Exception as e:
+            raise StorageError(f"Failed to load collection '{collection_name}': {e}") from e
+
+        self.collections[collection_name] = collection
+        return collection
+
+    def _save(self, collection_name: str, collection: _FaissCollection) -> None:
+        """Write a collection's index and documents to persist_dir."""
+        index_path, data_path = self._paths(collection_name)
+
+        if collection.index is not None:
+            faiss.write_index(collection.index, str(index_path))
+
+        data_path.write_text(
+            json.dumps(
+                {
+                    "metadata": collection.metadata,
+                    "ids": collection.ids,
+                    "documents": collection.documents,
+                    "metadatas": collection.metadatas,
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    def _paths(self, collection_name: str) -> tuple[Path, Path]:
+        """Index file and document file for a collection."""
+        return (
+            self.persist_dir / f"{collection_name}.index",
+            self.persist_dir / f"{collection_name}.json",
+        )
+
+
+def get_faiss_adapter() -> FaissAdapter:
+    """
+    Get a configured FAISS adapter instance.
+
+    Returns:
+        Initialized FaissAdapter
+    """
+    return FaissAdapter()
@@ -5,7 +5,17 @@ Provides a unified interface for different LLM implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections.abc import AsyncIterator, Iterator
+from typing import Final, Optional
+
+# Default RAG instructions; a constant string so every request starts with
+# the same prefix, which a server-side prompt cache can reuse between calls
+_DEFAULT_RAG_SYSTEM_PROMPT: Final[str] = (
+    "You are a helpful assistant that answers questions based on the provided context. "
+    "Use the context to answer the question accurately. "
+    "If you use information from the context, cite the source. "
+    "If the context doesn't contain relevant information, say so."
+)
 
 
 class LLMAdapter(ABC):
@@ -62,6 +72,195 @@ class LLMAdapter(ABC):
         """
         pass
 
+    @abstractmethod
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> str:
+        """
+        Async variant of generate().
+
+        Lets callers run several completions concurrently (e.g. with
+        asyncio.gather) instead of waiting for each one in turn.
+
+        Args:
+            prompt: The user prompt/query
+            system_prompt: Optional system prompt for instructions
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            Generated text response
+        """
+        pass
+
+    @abstractmethod
+    async def achat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> str:
+        """
+        Async variant of chat().
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            Generated response text
+        """
+        pass
+
+    def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion as text deltas.
+
+        Adapters without streaming support fall back to yielding the full
+        chat() response as a single delta.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Pieces of the generated response, in order
+        """
+        yield self.chat(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
+    async def astream_chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion as text deltas.
+
+        Adapters without streaming support fall back to yielding the full
+        achat() response as a single delta.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Pieces of the generated response, in order
+        """
+        yield await self.achat(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
+    def generate_with_context(
+        self,
+        query: str,
+        context: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """
+        Generate response using query and retrieved context.
+
+        This is a convenience method for RAG that formats the context
+        into the prompt and calls generate().
+
+        Args:
+            query: User query
+            context: Retrieved context from vector search
+            system_prompt: Optional system instructions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated response
+        """
+        prompt, system_prompt = self._build_context_prompt(query, context, system_prompt)
+
+        return self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    async def agenerate_with_context(
+        self,
+        query: str,
+        context: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """
+        Async variant of generate_with_context(), built on agenerate().
+
+        Args:
+            query: User query
+            context: Retrieved context from vector search
+            system_prompt: Optional system instructions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated response
+        """
+        prompt, system_prompt = self._build_context_prompt(query, context, system_prompt)
+
+        return await self.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    async def astream_with_context(
+        self,
+        query: str,
+        context: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_with_context(), built on astream_chat().
+
+        Args:
+            query: User query
+            context: Retrieved context from vector search
+            system_prompt: Optional system instructions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Pieces of the generated response, in order
+        """
+        prompt, system_prompt = self._build_context_prompt(query, context, system_prompt)
+        messages = self._build_prompt_messages(prompt, system_prompt)
+
+        async for delta in self.astream_chat(
+            messages, temperature=temperature, max_tokens=max_tokens
+        ):
+            yield delta
+
     @abstractmethod
     def get_model_info(self) -> dict:
         """
@@ -82,6 +281,40 @@ class LLMAdapter(ABC):
         """
         pass
 
+    @staticmethod
+    def _build_context_prompt(
+        query: str, context: str, system_prompt: Optional[str]
+    ) -> tuple[str, str]:
+        """
+        Format the RAG prompt and fill in the default system prompt.
+
+        Static text comes first and the question last, so consecutive
+        questions over the same context share the longest possible prefix.
+        """
+        # Default RAG system prompt if none provided
+        if system_prompt is None:
+            system_prompt = _DEFAULT_RAG_SYSTEM_PROMPT
+
+        # Format the prompt with context
+        prompt = f"""Context:
+{context}
+
+Question: {query}
+
+Answer:"""
+
+        return prompt, system_prompt
+
+    @staticmethod
+    def _build_prompt_messages(prompt: str, system_prompt: Optional[str]) -> list[dict[str, str]]:
+        """Build the message list sent by generate()/agenerate()."""
+        if system_prompt:
+            return [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ]
+        return [{"role": "user", "content": prompt}]
+
 
 class LLMError(Exception):
     """Base exception for LLM errors."""
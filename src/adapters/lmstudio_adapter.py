@@ -4,9 +4,20 @@ LMStudio adapter implementation using OpenAI-compatible API.
 LMStudio provides a local OpenAI-compatible API server for running LLMs.
 """
 
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import json
+import socket
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
 from typing import Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
 from src.adapters.llm_adapter import (
     LLMAdapter,
@@ -19,6 +30,10 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Kernel receive buffer for LMStudio connections, so long streamed completions
+# are drained in large reads instead of throttling on a small socket buffer
+_SOCKET_RECV_BUFFER_BYTES = 4 * 1024 * 1024
+
 
 class LMStudioAdapter(LLMAdapter):
     """
@@ -28,14 +43,42 @@ class LMStudioAdapter(LLMAdapter):
     OpenAI-compatible API server (typically running on localhost:1234).
 
     Note: Automatically handles models that don't support 'system' role by
-    prepending system prompts to user messages.
+    prepending system prompts to user messages. Pass supports_system_role=True
+    (or set LMSTUDIO_SUPPORTS_SYSTEM_ROLE) to send them as system messages.
+
+    is_available() and get_model_info() results are cached briefly so
+    repeated status checks don't each cost a round trip to the server.
+    Deterministic chat completions (temperature <= EXACT_CACHE_MAX_TEMPERATURE)
+    are kept in an in-process LRU cache keyed by the exact request, and
+    identical requests already in flight are sent once, with every caller
+    sharing the one response.
     """
 
+    # Seconds to reuse a status check / model lookup
+    AVAILABILITY_TTL = 5.0
+    MODEL_INFO_TTL = 60.0
+
+    # Status checks fail fast: no retries and short timeouts. After
+    # UNAVAILABLE_THRESHOLD failed checks in a row, "unavailable" is reused
+    # for UNAVAILABLE_TTL seconds instead of probing every AVAILABILITY_TTL
+    HEALTH_CHECK_TIMEOUT = httpx.Timeout(connect=0.5, read=2.0, write=2.0, pool=0.5)
+    UNAVAILABLE_THRESHOLD = 5
+    UNAVAILABLE_TTL = 30.0
+
+    # Exact-match completion cache: entries kept, and the highest temperature
+    # at which outputs are treated as deterministic
+    EXACT_CACHE_SIZE = 1024
+    EXACT_CACHE_MAX_TEMPERATURE = 0.01
+
+    # Generation can take minutes on CPU; connecting to localhost should not
+    HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=120.0, write=30.0, pool=5.0)
+
     def __init__(
         self,
         base_url: Optional[str] = None,
         model: Optional[str] = None,
         api_key: str = "lm-studio",  # LMStudio doesn't require a real key
+        supports_system_role: Optional[bool] = None,
     ):
         """
         Initialize LMStudio adapter.
@@ -44,20 +87,95 @@ class LMStudioAdapter(LLMAdapter):
             base_url: LMStudio API base URL (default: from settings)
             model: Model name (default: from settings)
             api_key: API key (LMStudio accepts any value)
+            supports_system_role: Whether the model accepts 'system' messages
+                (default: from settings)
         """
         settings = get_settings()
         self.base_url = base_url or settings.lmstudio_base_url
         self.model = model or settings.lmstudio_model
         self.api_key = api_key
+        self.supports_system_role = (
+            settings.lmstudio_supports_system_role
+            if supports_system_role is None
+            else supports_system_role
+        )
 
-        # Initialize OpenAI client pointed at LMStudio
+        # One pooled HTTP client per OpenAI client, so keep-alive connections
+        # are reused across calls instead of paying a TCP handshake each time
+        limits = httpx.Limits(
+            max_connections=settings.lmstudio_http_max_connections,
+            max_keepalive_connections=settings.lmstudio_http_max_keepalive_connections,
+            keepalive_expiry=60.0,
+        )
+        socket_options = [(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_RECV_BUFFER_BYTES)]
+        self._http = DefaultHttpxClient(
+            transport=httpx.HTTPTransport(
+                limits=limits, http2=False, retries=0, socket_options=socket_options
+            ),
+            timeout=self.HTTP_TIMEOUT,
+        )
+        self._ahttp = DefaultAsyncHttpxClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=limits, http2=False, retries=0, socket_options=socket_options
+            ),
+            timeout=self.HTTP_TIMEOUT,
+        )
+
+        # Initialize OpenAI clients pointed at LMStudio
         self.client = OpenAI(
             base_url=self.base_url,
             api_key=self.api_key,
+            http_client=self._http,
         )
+        self.aclient = AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=self._ahttp,
+        )
+
+        # Same connections, but without retries or long timeouts, for status checks
+        self._probe_client = self.client.with_options(
+            max_retries=0, timeout=self.HEALTH_CHECK_TIMEOUT
+        )
+
+        # key -> (expires_at, value) for is_available/get_model_info
+        self._status_cache: dict[str, tuple[float, object]] = {}
+        self._status_lock = threading.Lock()
+        self._failed_checks = 0
+
+        # request hash -> completion, least recently used first
+        self._exact_cache: OrderedDict[str, str] = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+
+        # request hash -> pending response shared by identical concurrent calls.
+        # The async map needs no lock: nothing awaits between lookup and insert.
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._sync_inflight: dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
 
         logger.info(f"LMStudio adapter initialized (base_url={self.base_url})")
 
+    def close(self) -> None:
+        """Close the synchronous HTTP client and its pooled connections."""
+        self._http.close()
+
+    async def aclose(self) -> None:
+        """Close both HTTP clients; call from the event loop that used aclient."""
+        self.close()
+        await self._ahttp.aclose()
+
+    def __enter__(self) -> "LMStudioAdapter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "LMStudioAdapter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def generate(
         self,
         prompt: str,
@@ -71,7 +189,8 @@ class LMStudioAdapter(LLMAdapter):
 
         Args:
             prompt: The user prompt/query
-            system_prompt: Optional system prompt (will be prepended to user message)
+            system_prompt: Optional system prompt (folded into the user message
+                unless supports_system_role)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             **kwargs: Additional parameters
@@ -79,16 +198,36 @@ class LMStudioAdapter(LLMAdapter):
         Returns:
             Generated text response
         """
-        # Build messages
-        # Note: Some models don't support "system" role, so we prepend system prompt to user message
-        if system_prompt:
-            combined_prompt = f"{system_prompt}\n\n{prompt}"
-            messages = [{"role": "user", "content": combined_prompt}]
-        else:
-            messages = [{"role": "user", "content": prompt}]
+        messages = self._build_prompt_messages(prompt, system_prompt)
 
         return self.chat(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
 
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> str:
+        """
+        Async variant of generate() using the AsyncOpenAI client.
+
+        Args:
+            prompt: The user prompt/query
+            system_prompt: Optional system prompt (folded into the user message
+                unless supports_system_role)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Returns:
+            Generated text response
+        """
+        messages = self._build_prompt_messages(prompt, system_prompt)
+
+        return await self.achat(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
     def chat(
         self,
         messages: list[dict[str, str]],
@@ -113,48 +252,248 @@ class LMStudioAdapter(LLMAdapter):
 
             # Handle models that don't support "system" role
             # Convert system messages to be prepended to the first user message
-            processed_messages = self._process_messages_for_compatibility(messages)
+            # (system messages stay first, so requests share a cacheable prefix)
+            processed_messages = self._prepare_messages(messages)
+
+            request_key = self._request_key(processed_messages, temperature, max_tokens, kwargs)
+            cacheable = temperature <= self.EXACT_CACHE_MAX_TEMPERATURE
+            if cacheable:
+                cached = self._get_exact_cached(request_key)
+                if cached is not None:
+                    logger.debug("Returning cached response")
+                    return cached
+
+            # Share the response of an identical request already in flight
+            with self._inflight_lock:
+                inflight = self._sync_inflight.get(request_key)
+                if inflight is None:
+                    future = concurrent.futures.Future()
+                    self._sync_inflight[request_key] = future
+            if inflight is not None:
+                logger.debug("Waiting for identical in-flight request")
+                return inflight.result()
+
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=processed_messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+
+                # Extract the generated text
+                generated_text = response.choices[0].message.content
+                future.set_result(generated_text)
+
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+
+            finally:
+                with self._inflight_lock:
+                    del self._sync_inflight[request_key]
+
+            logger.debug(f"Generated response: {len(generated_text)} characters")
+
+            if cacheable:
+                self._set_exact_cached(request_key, generated_text)
+            return generated_text
+
+        except Exception as e:
+            logger.error(f"Failed to generate response: {e}", exc_info=True)
+            raise self._categorize_error(e) from e
+
+    async def achat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> str:
+        """
+        Async variant of chat() using the AsyncOpenAI client.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Returns:
+            Generated response text
+        """
+        try:
+            processed_messages = self._prepare_messages(messages)
+
+            request_key = self._request_key(processed_messages, temperature, max_tokens, kwargs)
+            cacheable = temperature <= self.EXACT_CACHE_MAX_TEMPERATURE
+            if cacheable:
+                cached = self._get_exact_cached(request_key)
+                if cached is not None:
+                    return cached
+
+            # Share the response of an identical request already in flight. The
+            # request runs in its own task and every caller awaits it through a
+            # shield, so a cancelled caller (even the first) doesn't cancel the others
+            task = self._inflight.get(request_key)
+            if task is None:
+                payload = {
+                    "model": self.model,
+                    "messages": processed_messages,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    **kwargs,
+                }
+                task = asyncio.ensure_future(self._achat_request(payload))
+                self._inflight[request_key] = task
+                task.add_done_callback(
+                    functools.partial(self._finish_inflight, request_key, cacheable)
+                )
+
+            return await asyncio.shield(task)
 
-            response = self.client.chat.completions.create(
+        except Exception as e:
+            logger.error(f"Failed to generate response: {e}", exc_info=True)
+            raise self._categorize_error(e) from e
+
+    async def _achat_request(self, payload: dict) -> str:
+        """Run one chat completion request for achat()."""
+        response = await self.aclient.chat.completions.create(**payload)
+        return response.choices[0].message.content
+
+    def _finish_inflight(self, request_key: str, cacheable: bool, task: asyncio.Task) -> None:
+        """Drop a finished shared request, caching its response when deterministic."""
+        del self._inflight[request_key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also marks it handled when no caller is left
+        if task.exception() is None and cacheable:
+            self._set_exact_cached(request_key, task.result())
+
+    def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion from LMStudio as text deltas.
+
+        Lets a synchronous UI render the answer while the model is still
+        decoding, instead of waiting for chat() to return the whole text.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Yields:
+            Pieces of the generated response, in order
+        """
+        try:
+            processed_messages = self._prepare_messages(messages)
+
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=processed_messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                stream=True,
                 **kwargs,
             )
 
-            # Extract the generated text
-            generated_text = response.choices[0].message.content
+            with stream:
+                for chunk in stream:
+                    if chunk.choices and (delta := chunk.choices[0].delta.content):
+                        yield delta
 
-            logger.debug(f"Generated response: {len(generated_text)} characters")
+        except Exception as e:
+            logger.error(f"Failed to stream response: {e}", exc_info=True)
+            raise self._categorize_error(e) from e
 
-            return generated_text
+    async def astream_chat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from LMStudio as text deltas.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Yields:
+            Pieces of the generated response, in order
+        """
+        try:
+            processed_messages = self._prepare_messages(messages)
+
+            stream = await self.aclient.chat.completions.create(
+                model=self.model,
+                messages=processed_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs,
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
         except Exception as e:
-            logger.error(f"Failed to generate response: {e}", exc_info=True)
+            logger.error(f"Failed to stream response: {e}", exc_info=True)
+            raise self._categorize_error(e) from e
 
-            # Categorize the error
-            error_msg = str(e).lower()
-            if "connection" in error_msg or "refused" in error_msg:
-                raise LLMConnectionError(
-                    f"Cannot connect to LMStudio at {self.base_url}. "
-                    "Make sure LMStudio server is running."
-                ) from e
-            elif "model" in error_msg and "not found" in error_msg:
-                raise LLMModelNotFoundError(
-                    f"Model '{self.model}' not found. "
-                    "Make sure the model is loaded in LMStudio."
-                ) from e
-            else:
-                raise LLMGenerationError(f"Failed to generate response: {e}") from e
+    def _categorize_error(self, error: Exception) -> Exception:
+        """
+        Map a client error to the matching LLMError subclass.
+
+        A connection error also marks the server unavailable in the status
+        cache, so is_available() doesn't keep reporting a stale True.
+        """
+        error_msg = str(error).lower()
+        if "connection" in error_msg or "refused" in error_msg:
+            self._set_cached_status("available", False, self.AVAILABILITY_TTL)
+            return LLMConnectionError(
+                f"Cannot connect to LMStudio at {self.base_url}. "
+                "Make sure LMStudio server is running."
+            )
+        elif "model" in error_msg and "not found" in error_msg:
+            return LLMModelNotFoundError(
+                f"Model '{self.model}' not found. "
+                "Make sure the model is loaded in LMStudio."
+            )
+        else:
+            return LLMGenerationError(f"Failed to generate response: {error}")
+
+    def _prepare_messages(self, messages: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Messages as sent to the server, folding system messages if unsupported."""
+        if self.supports_system_role:
+            return messages
+        return self._process_messages_for_compatibility(messages)
 
     def get_model_info(self) -> dict:
         """
         Get information about the current model.
 
+        Successful lookups are cached for MODEL_INFO_TTL seconds.
+
         Returns:
             Dictionary with model information
         """
+        cached = self._get_cached_status("model_info")
+        if cached is not None:
+            return dict(cached)
+
         try:
             # Try to get available models
             models = self.client.models.list()
@@ -178,7 +517,8 @@ class LMStudioAdapter(LLMAdapter):
                     "status": "unknown",
                 }
 
-            return model_info
+            self._set_cached_status("model_info", model_info, self.MODEL_INFO_TTL)
+            return dict(model_info)
 
         except Exception as e:
             logger.warning(f"Could not fetch model info: {e}")
@@ -192,17 +532,86 @@ class LMStudioAdapter(LLMAdapter):
         """
         Check if LMStudio service is available.
 
+        The check is a single model listing with HEALTH_CHECK_TIMEOUT and no
+        retries. The answer is cached for AVAILABILITY_TTL seconds, or for
+        UNAVAILABLE_TTL once the server has failed several checks in a row.
+
         Returns:
             True if service is reachable, False otherwise
         """
+        cached = self._get_cached_status("available")
+        if cached is not None:
+            return cached
+
         try:
             # Try to list models as a health check
-            self.client.models.list()
-            return True
+            self._probe_client.models.list()
+            available = True
 
         except Exception as e:
             logger.debug(f"LMStudio not available: {e}")
-            return False
+            available = False
+
+        return self._record_availability(available)
+
+    def _record_availability(self, available: bool) -> bool:
+        """Cache a status check result, backing off after repeated failures."""
+        with self._status_lock:
+            self._failed_checks = 0 if available else self._failed_checks + 1
+            backing_off = self._failed_checks >= self.UNAVAILABLE_THRESHOLD
+
+        ttl = self.UNAVAILABLE_TTL if backing_off else self.AVAILABILITY_TTL
+        self._set_cached_status("available", available, ttl)
+        return available
+
+    def _get_cached_status(self, key: str):
+        """Return a cached status value, or None if missing or expired."""
+        with self._status_lock:
+            entry = self._status_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _set_cached_status(self, key: str, value, ttl: float) -> None:
+        """Cache a status value for ttl seconds."""
+        with self._status_lock:
+            self._status_cache[key] = (time.monotonic() + ttl, value)
+
+    def _request_key(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        kwargs: dict,
+    ) -> str:
+        """Hash a chat request for the exact-match cache and in-flight map."""
+        request = {
+            "m": self.model,
+            "msgs": messages,
+            "t": temperature,
+            "mt": max_tokens,
+            "kw": kwargs,
+        }
+        canonical = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _get_exact_cached(self, key: str) -> Optional[str]:
+        """Return a cached completion and mark it recently used, or None."""
+        with self._exact_cache_lock:
+            completion = self._exact_cache.get(key)
+            if completion is not None:
+                self._exact_cache.move_to_end(key)
+            return completion
+
+    def _set_exact_cached(self, key: str, completion: Optional[str]) -> None:
+        """Cache a completion, evicting the least recently used beyond EXACT_CACHE_SIZE."""
+        if completion is None:
+            return
+        with self._exact_cache_lock:
+            self._exact_cache[key] = completion
+            self._exact_cache.move_to_end(key)
+            while len(self._exact_cache) > self.EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
 
     def _process_messages_for_compatibility(
         self, messages: list[dict[str, str]]
@@ -219,84 +628,39 @@ class LMStudioAdapter(LLMAdapter):
         Returns:
             Processed messages list with only 'user' and 'assistant' roles
         """
-        if not messages:
+        # Common case: nothing to fold, so skip building a new list
+        if not any(msg.get("role") == "system" for msg in messages):
             return messages
 
-        processed = []
-        system_content = []
+        # Single pass: split out system content and note the first user message
+        system_content: list[str] = []
+        processed: list[dict[str, str]] = []
+        add_system = system_content.append
+        add_message = processed.append
+        first_user = None
 
-        # Collect all system messages
         for msg in messages:
-            if msg.get("role") == "system":
-                system_content.append(msg["content"])
+            role = msg.get("role")
+            if role == "system":
+                add_system(msg["content"])
             else:
-                processed.append(msg)
-
-        # If we have system messages and user messages, prepend system to first user message
-        if system_content and processed:
-            # Find first user message
-            for i, msg in enumerate(processed):
-                if msg.get("role") == "user":
-                    # Prepend system content
-                    system_text = "\n\n".join(system_content)
-                    processed[i] = {
-                        "role": "user",
-                        "content": f"{system_text}\n\n{msg['content']}",
-                    }
-                    break
-        elif system_content and not processed:
-            # Only system messages, convert to user message
-            processed = [{"role": "user", "content": "\n\n".join(system_content)}]
-
-        return processed
-
-    def generate_with_context(
-        self,
-        query: str,
-        context: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
-    ) -> str:
-        """
-        Generate response using query and retrieved context.
-
-        This is a convenience method for RAG that formats the context
-        into the prompt.
-
-        Args:
-            query: User query
-            context: Retrieved context from vector search
-            system_prompt: Optional system instructions
-            temperature: Sampling temperature
-            max_tokens: Maximum tokens to generate
-
-        Returns:
-            Generated response
-        """
-        # Default RAG system prompt if none provided
-        if system_prompt is None:
-            system_prompt = (
-                "You are a helpful assistant that answers questions based on the provided context. "
-                "Use the context to answer the question accurately. "
-                "If you use information from the context, cite the source. "
-                "If the context doesn't contain relevant information, say so."
-            )
+                if first_user is None and role == "user":
+                    first_user = len(processed)
+                add_message(msg)
 
-        # Format the prompt with context
-        prompt = f"""Context:
-{context}
+        system_text = "\n\n".join(system_content)
 
-Question: {query}
-
-Answer:"""
+        if first_user is not None:
+            # Prepend system content to a copy of the first user message only
+            processed[first_user] = {
+                "role": "user",
+                "content": f"{system_text}\n\n{processed[first_user]['content']}",
+            }
+        elif not processed:
+            # Only system messages, convert to user message
+            processed = [{"role": "user", "content": system_text}]
 
-        return self.generate(
-            prompt=prompt,
-            system_prompt=system_prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+        return processed
 
 
 def get_lmstudio_adapter() -> LMStudioAdapter:
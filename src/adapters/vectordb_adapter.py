@@ -5,9 +5,21 @@ Provides a unified interface for different vector database implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-from src.models.schemas import DocumentChunk
+import numpy as np
+
+from src.models.schemas import DocumentChunk, SearchResult
+
+# Vectors may be passed as NumPy arrays (preferred: adapters convert them to
+# contiguous float32 without walking Python lists) or as plain lists
+Embedding = Union[np.ndarray, list[float]]
+Embeddings = Union[np.ndarray, list[list[float]]]
+
+# Deletes every ASCII character not allowed in a collection name, in one C pass
+_DROP_ASCII_NAME_CHARS = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if not (c.isalnum() or c == "_"))
+)
 
 
 class VectorDBAdapter(ABC):
@@ -62,7 +74,7 @@ class VectorDBAdapter(ABC):
         self,
         collection_name: str,
         chunks: list[DocumentChunk],
-        embeddings: list[list[float]],
+        embeddings: Embeddings,
     ) -> None:
         """
         Store document chunks with their embeddings in the database.
@@ -70,7 +82,7 @@ class VectorDBAdapter(ABC):
         Args:
             collection_name: Name of the collection to store in
             chunks: List of DocumentChunk objects
-            embeddings: List of embedding vectors (must match chunks length)
+            embeddings: 2-D array or list of embedding vectors (must match chunks length)
         """
         pass
 
@@ -78,7 +90,7 @@ class VectorDBAdapter(ABC):
     def similarity_search(
         self,
         collection_name: str,
-        query_embedding: list[float],
+        query_embedding: Embedding,
         k: int = 5,
         filter_metadata: Optional[dict] = None,
     ) -> list[tuple[DocumentChunk, float]]:
@@ -96,6 +108,88 @@ class VectorDBAdapter(ABC):
         """
         pass
 
+    def similarity_search_many(
+        self,
+        collection_name: str,
+        query_embeddings: Embeddings,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """
+        Search for several queries at once.
+
+        The default runs one similarity_search per query; adapters whose
+        backend accepts a batch of query vectors should override this.
+
+        Args:
+            collection_name: Name of the collection to search in
+            query_embeddings: Query vectors (2-D array or list of lists)
+            k: Number of results per query
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            One list of (DocumentChunk, similarity_score) tuples per query
+        """
+        return [
+            self.similarity_search(collection_name, query_embedding, k, filter_metadata)
+            for query_embedding in query_embeddings
+        ]
+
+    def similarity_search_columns(
+        self,
+        collection_name: str,
+        query_embedding: Embedding,
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+    ) -> SearchResult:
+        """
+        Search like similarity_search, returning parallel columns instead of tuples.
+
+        Adapters whose backend already returns columnar results should override
+        this to skip building DocumentChunk objects.
+
+        Args:
+            collection_name: Name of the collection to search in
+            query_embedding: Query vector
+            k: Number of results to return
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            SearchResult with one entry per hit, best first
+        """
+        results = self.similarity_search(collection_name, query_embedding, k, filter_metadata)
+        return SearchResult(
+            ids=[chunk.chunk_id for chunk, _ in results],
+            scores=np.fromiter((score for _, score in results), dtype=np.float32, count=len(results)),
+            contents=[chunk.content for chunk, _ in results],
+            section_titles=[chunk.section_title for chunk, _ in results],
+            metadatas=[chunk.metadata for chunk, _ in results],
+        )
+
+    def warmup(self, collection_name: str, dimension: int) -> None:
+        """
+        Prepare a freshly loaded collection for its first query.
+
+        No-op by default; adapters whose first search pays a one-off cost
+        (e.g. loading an index on a server) can run a throwaway query here.
+
+        Args:
+            collection_name: Name of the collection
+            dimension: Embedding dimension of the collection
+        """
+
+    def flush(self, collection_name: Optional[str] = None) -> None:
+        """
+        Persist writes buffered by store_documents.
+
+        No-op by default; adapters that keep collections in memory and save
+        them to disk write them out here, so an ingest is saved once rather
+        than after every batch.
+
+        Args:
+            collection_name: Collection to persist (default: all with pending writes)
+        """
+
     @abstractmethod
     def get_collection_info(self, collection_name: str) -> dict:
         """
@@ -131,8 +225,11 @@ class VectorDBAdapter(ABC):
         """
         # Sanitize collection name (lowercase, replace spaces with underscores)
         sanitized = page_title.lower().replace(" ", "_")
-        # Remove special characters
-        sanitized = "".join(c for c in sanitized if c.isalnum() or c == "_")
+        # Remove special characters (non-ASCII titles keep their Unicode letters)
+        if sanitized.isascii():
+            sanitized = sanitized.translate(_DROP_ASCII_NAME_CHARS)
+        else:
+            sanitized = "".join(c for c in sanitized if c.isalnum() or c == "_")
         # Prefix to identify as wikipedia
         return f"wiki_{sanitized}"
 
@@ -4,10 +4,19 @@ Data models and schemas for the RAG Wikipedia Chatbot.
 These Pydantic models ensure type safety and validation throughout the application.
 """
 
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+import numpy as np
+import xxhash
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+
+# Allowed values for validated string fields (hashed membership tests)
+_VALID_ROLES: frozenset[str] = frozenset({"user", "assistant", "system"})
+_VALID_STRATEGIES: frozenset[str] = frozenset({"semantic", "fixed", "hybrid"})
 
 
 class WikipediaSection(BaseModel):
@@ -58,14 +67,22 @@ class WikipediaPage(BaseModel):
         """Get all text content including title and sections."""
         return f"{self.title}\n\n{self.summary}\n\n{self.raw_content}"
 
-    @property
+    @cached_property
     def word_count(self) -> int:
-        """Count total words in the page."""
-        return len(self.full_text.split())
+        """Count total words in the page (counted once, without building full_text)."""
+        return sum(len(part.split()) for part in (self.title, self.summary, self.raw_content))
 
 
 class DocumentChunk(BaseModel):
-    """Represents a chunk of text from a document."""
+    """
+    Represents a chunk of text from a document.
+
+    Immutable once built: chunks are created in bulk at ingest and shared
+    between search results, so fields can't be reassigned and unknown
+    fields are rejected.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     chunk_id: str = Field(..., description="Unique identifier for the chunk")
     content: str = Field(..., description="Chunk text content")
@@ -76,6 +93,24 @@ class DocumentChunk(BaseModel):
     chunk_index: int = Field(..., ge=0, description="Position in document (0-indexed)")
     token_count: Optional[int] = Field(None, description="Approximate token count")
 
+    @classmethod
+    def make_id(cls, content: str, *, source_url: str, idx: int) -> str:
+        """
+        Canonical chunk ID: a 64-bit xxh3 digest of source URL, index and content.
+
+        IDs only need to be stable and unique within a collection, not
+        tamper-proof, so a non-cryptographic hash keeps ingest cheap.
+
+        Args:
+            content: Chunk text content
+            source_url: Source Wikipedia page URL
+            idx: Position of the chunk in its document
+
+        Returns:
+            16-character hex ID
+        """
+        return xxhash.xxh3_64_hexdigest(f"{source_url}|{idx}|{content}".encode())
+
     @field_validator("content")
     @classmethod
     def content_not_empty(cls, v: str) -> str:
@@ -84,21 +119,102 @@ class DocumentChunk(BaseModel):
             raise ValueError("Chunk content cannot be empty")
         return v
 
+    def preview(self, n: int = 150) -> str:
+        """Short display snippet: the first n characters, with '...' if truncated."""
+        content = self.content
+        return content if len(content) <= n else f"{content[:n]}..."
+
     def to_langchain_document(self) -> dict:
-        """Convert to LangChain Document format."""
+        """
+        Convert to LangChain Document format.
+
+        The metadata dict is built on the first call and shared by later
+        calls (the chunk is frozen, so it can't go stale); copy it before
+        mutating.
+        """
+        return {"page_content": self.content, "metadata": self._langchain_metadata}
+
+    @cached_property
+    def _langchain_metadata(self) -> dict:
+        """Metadata for to_langchain_document(), built once per chunk."""
         return {
-            "page_content": self.content,
-            "metadata": {
-                **self.metadata,
-                "source": self.source_url,
-                "title": self.source_page_title,
-                "section": self.section_title or "Main",
-                "chunk_id": self.chunk_id,
-                "chunk_index": self.chunk_index,
-            },
+            **self.metadata,
+            "source": self.source_url,
+            "title": self.source_page_title,
+            "section": self.section_title or "Main",
+            "chunk_id": self.chunk_id,
+            "chunk_index": self.chunk_index,
         }
 
 
+@dataclass
+class SearchResult:
+    """
+    Column-oriented (struct-of-arrays) similarity search results.
+
+    Parallel sequences indexed by rank, built straight from the vector
+    database's columnar response without creating a DocumentChunk per hit.
+    A plain dataclass rather than a Pydantic model to skip validation on
+    the result-display path. Iterating yields (DocumentChunk, score) pairs,
+    so it can stand in for similarity_search's list of tuples.
+    """
+
+    ids: list[str] = field(default_factory=list)
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    contents: list[str] = field(default_factory=list)
+    section_titles: list[Optional[str]] = field(default_factory=list)
+    metadatas: list[dict] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[tuple["DocumentChunk", float]]:
+        """Yield (DocumentChunk, score) pairs, building each chunk on demand."""
+        for i, score in enumerate(self.scores.tolist()):
+            yield self.chunk(i), score
+
+    def chunk(self, i: int) -> "DocumentChunk":
+        """
+        Rebuild the i-th hit as a DocumentChunk.
+
+        Stored chunks were validated at ingest, so this uses model_construct
+        and skips re-running Pydantic validation.
+        """
+        metadata = self.metadatas[i]
+        get = metadata.get
+        return DocumentChunk.model_construct(
+            chunk_id=self.ids[i],
+            content=self.contents[i],
+            metadata=metadata,
+            source_page_title=get("page_title", ""),
+            source_url=get("page_url", ""),
+            section_title=self.section_titles[i],
+            chunk_index=int(get("chunk_index", 0)),
+        )
+
+    def top_k(self, k: int) -> "SearchResult":
+        """Best k hits by score, highest first (O(n) selection before sorting)."""
+        if k >= len(self):
+            order = np.argsort(-self.scores, kind="stable")
+        else:
+            best = np.argpartition(-self.scores, k)[:k]
+            order = best[np.argsort(-self.scores[best], kind="stable")]
+
+        rows = order.tolist()
+        return SearchResult(
+            ids=[self.ids[i] for i in rows],
+            scores=self.scores[order],
+            contents=[self.contents[i] for i in rows],
+            section_titles=[self.section_titles[i] for i in rows],
+            metadatas=[self.metadatas[i] for i in rows],
+        )
+
+    def preview(self, i: int, n: int = 150) -> str:
+        """Short display snippet of the i-th result (see DocumentChunk.preview)."""
+        content = self.contents[i]
+        return content if len(content) <= n else f"{content[:n]}..."
+
+
 class QueryResult(BaseModel):
     """Represents a query result with retrieved context."""
 
@@ -117,14 +233,22 @@ class QueryResult(BaseModel):
         """Number of retrieved chunks."""
         return len(self.retrieved_chunks)
 
+    @cached_property
+    def avg_similarity(self) -> float:
+        """Mean similarity of the retrieved chunks (0.0 if none), computed once."""
+        scores = self.similarity_scores
+        return sum(scores) / len(scores) if scores else 0.0
+
     @property
     def sources(self) -> list[str]:
-        """Unique source URLs from retrieved chunks."""
-        return list(set(chunk.source_url for chunk in self.retrieved_chunks))
+        """Unique source URLs from retrieved chunks, in retrieval rank order."""
+        return list(dict.fromkeys(chunk.source_url for chunk in self.retrieved_chunks))
 
 
 class ChatMessage(BaseModel):
-    """Represents a chat message."""
+    """Represents a chat message (immutable once added to a session)."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     role: str = Field(..., description="Message role: user, assistant, system")
     content: str = Field(..., description="Message content")
@@ -135,7 +259,7 @@ class ChatMessage(BaseModel):
     @classmethod
     def validate_role(cls, v: str) -> str:
         """Ensure role is valid."""
-        if v not in ["user", "assistant", "system"]:
+        if v not in _VALID_ROLES:
             raise ValueError("Role must be one of: user, assistant, system")
         return v
 
@@ -194,7 +318,7 @@ class ChunkingConfig(BaseModel):
     @classmethod
     def validate_strategy(cls, v: str) -> str:
         """Ensure strategy is valid."""
-        if v not in ["semantic", "fixed", "hybrid"]:
+        if v not in _VALID_STRATEGIES:
             raise ValueError("Strategy must be one of: semantic, fixed, hybrid")
         return v
 
@@ -213,7 +337,7 @@ class RAGConfig(BaseModel):
 
     top_k: int = Field(default=5, ge=1, le=20, description="Number of chunks to retrieve")
     min_similarity_score: float = Field(
-        default=0.7, ge=0.0, le=1.0, description="Minimum similarity score threshold"
+        default=0.89, ge=0.0, le=1.0, description="Minimum similarity score threshold"
     )
     llm_temperature: float = Field(
         default=0.7, ge=0.0, le=2.0, description="LLM temperature parameter"
@@ -4,18 +4,50 @@ Document processing pipeline for chunking and preprocessing Wikipedia content.
 Handles text cleaning, chunking strategies, and metadata preservation.
 """
 
-import hashlib
 import re
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.models.schemas import ChunkingConfig, DocumentChunk, WikipediaPage, WikipediaSection
 from src.utils.config import get_settings
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from transformers import PreTrainedTokenizerBase
+
 logger = get_logger(__name__)
 
+_ELLIPSIS_RE = re.compile(r"\.{3,}")
+# Markup matches never span _TEXT_SEPARATOR, so joined texts clean like separate ones
+_WIKI_MARKUP_RE = re.compile(
+    r"\{\{[^}\x00]+\}\}|\[\[([^\]|\x00]+)(?:\|[^\]\x00]+)?\]\]|\[\d+\]"
+)
+_TEXT_SEPARATOR = "\x00"
+
+
+def _replace_wiki_markup(match: re.Match) -> str:
+    """Keep a link's target; drop templates and reference markers."""
+    return match.group(1) or ""
+
+
+def _clean_wiki_text(text: str) -> str:
+    """Cleaning behind DocumentProcessor._clean_text."""
+    # One pass for Wikipedia markup that leaked through: drop {{templates}}
+    # and [1] reference markers, reduce [[target|label]] links to target.
+    # Substring checks (no regex scan) skip passes with nothing to do.
+    if "{{" in text or "[" in text:
+        text = _WIKI_MARKUP_RE.sub(_replace_wiki_markup, text)
+
+    # Remove excessive punctuation
+    if "..." in text:
+        text = _ELLIPSIS_RE.sub("...", text)
+
+    # Collapse whitespace, including gaps left by removed markup (str.split
+    # is ~3x faster than a regex sub and strips both ends)
+    return " ".join(text.split())
+
 
 class DocumentProcessor:
     """
@@ -24,12 +56,20 @@ class DocumentProcessor:
     Handles text cleaning, chunking, and metadata preservation.
     """
 
-    def __init__(self, chunking_config: Optional[ChunkingConfig] = None):
+    def __init__(
+        self,
+        chunking_config: Optional[ChunkingConfig] = None,
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
+    ):
         """
         Initialize the document processor.
 
         Args:
             chunking_config: Configuration for chunking strategy
+            tokenizer: Hugging Face tokenizer (e.g. the embedding model's) to
+                measure chunk_size/chunk_overlap and chunk token counts in
+                real tokens; without one, they are approximated as 4
+                characters per token
         """
         if chunking_config is None:
             settings = get_settings()
@@ -40,24 +80,41 @@ class DocumentProcessor:
             )
 
         self.config = chunking_config
+        self.tokenizer = tokenizer
 
         # Initialize text splitter
-        # Using character-based splitting with token approximation
-        # Rule of thumb: ~4 characters per token
-        char_chunk_size = self.config.chunk_size * 4
-        char_overlap = self.config.chunk_overlap * 4
-
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=char_chunk_size,
-            chunk_overlap=char_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-            is_separator_regex=False,
-        )
+        separators = ["\n\n", "\n", ". ", " ", ""]
+        if tokenizer is not None:
+            # Split by the tokens the embedding model will actually see
+            self.text_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+                tokenizer,
+                chunk_size=self.config.chunk_size,
+                chunk_overlap=self.config.chunk_overlap,
+                separators=separators,
+                is_separator_regex=False,
+            )
+            # A character is at most 4 (byte-level) tokens, so text this
+            # short always fits in one chunk
+            self._char_chunk_size = self.config.chunk_size // 4
+        else:
+            # Using character-based splitting with token approximation
+            # Rule of thumb: ~4 characters per token
+            char_chunk_size = self.config.chunk_size * 4
+            char_overlap = self.config.chunk_overlap * 4
+            self._char_chunk_size = char_chunk_size
+
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=char_chunk_size,
+                chunk_overlap=char_overlap,
+                length_function=len,
+                separators=separators,
+                is_separator_regex=False,
+            )
 
         logger.info(
             f"Initialized document processor with chunk_size={self.config.chunk_size}, "
-            f"overlap={self.config.chunk_overlap}, strategy={self.config.strategy}"
+            f"overlap={self.config.chunk_overlap}, strategy={self.config.strategy}, "
+            f"sizing={'tokenizer' if tokenizer is not None else 'chars/4'}"
         )
 
     def process_page(self, page: WikipediaPage) -> list[DocumentChunk]:
@@ -72,16 +129,14 @@ class DocumentProcessor:
         """
         logger.info(f"Processing page: {page.title}")
 
-        # Clean the content
-        cleaned_content = self._clean_text(page.raw_content)
-
-        # Choose chunking strategy
+        # Choose chunking strategy; section-based strategies clean each
+        # section themselves, so only fixed-size needs the whole page cleaned
         if self.config.strategy == "semantic":
-            chunks = self._chunk_by_sections(page, cleaned_content)
+            chunks = self._chunk_by_sections(page, page.raw_content)
         elif self.config.strategy == "fixed":
-            chunks = self._chunk_fixed_size(page, cleaned_content)
+            chunks = self._chunk_fixed_size(page, self._clean_text(page.raw_content))
         else:  # hybrid
-            chunks = self._chunk_hybrid(page, cleaned_content)
+            chunks = self._chunk_hybrid(page, page.raw_content)
 
         logger.info(
             f"Processed page '{page.title}' into {len(chunks)} chunks "
@@ -100,23 +155,30 @@ class DocumentProcessor:
         Returns:
             Cleaned text
         """
-        # Remove excessive whitespace
-        text = re.sub(r"\s+", " ", text)
+        return _clean_wiki_text(text)
+
+    def _clean_text_bulk(self, texts: list[str]) -> list[str]:
+        """
+        Clean many texts in a single traversal of each pattern.
 
-        # Remove special Wikipedia markup that might have leaked through
-        text = re.sub(r"\{\{[^}]+\}\}", "", text)  # Remove {{templates}}
-        text = re.sub(r"\[\[([^\]|]+)(\|[^\]]+)?\]\]", r"\1", text)  # Simplify [[links]]
+        The texts are joined with a separator no pattern can match across,
+        cleaned once, and split back apart.
 
-        # Remove reference markers like [1], [2], etc.
-        text = re.sub(r"\[\d+\]", "", text)
+        Args:
+            texts: Raw texts
 
-        # Remove excessive punctuation
-        text = re.sub(r"\.{3,}", "...", text)
+        Returns:
+            Cleaned texts, in input order
+        """
+        if not texts:
+            return []
 
-        # Clean up extra spaces
-        text = " ".join(text.split())
+        joined = _TEXT_SEPARATOR.join(texts)
+        if joined.count(_TEXT_SEPARATOR) != len(texts) - 1:
+            # A text contains the separator itself; clean one by one
+            return [self._clean_text(text) for text in texts]
 
-        return text.strip()
+        return [part.strip() for part in self._clean_text(joined).split(_TEXT_SEPARATOR)]
 
     def _chunk_fixed_size(self, page: WikipediaPage, content: str) -> list[DocumentChunk]:
         """
@@ -130,7 +192,10 @@ class DocumentProcessor:
             List of chunks
         """
         # Split text using LangChain's text splitter
-        text_chunks = self.text_splitter.split_text(content)
+        text_chunks = self._split_text(content)
+
+        page_metadata = self._page_metadata(page)
+        token_counts = self._count_tokens_batch(text_chunks)
 
         chunks = []
         for idx, chunk_text in enumerate(text_chunks):
@@ -139,6 +204,8 @@ class DocumentProcessor:
                 page=page,
                 section_title=None,
                 chunk_index=idx,
+                page_metadata=page_metadata,
+                token_count=token_counts[idx],
             )
             chunks.append(chunk)
 
@@ -150,79 +217,71 @@ class DocumentProcessor:
 
         Args:
             page: Wikipedia page with sections
-            content: Cleaned content
+            content: Page content (unused; sections are cleaned individually)
 
         Returns:
             List of chunks
         """
-        chunks = []
-        chunk_index = 0
-
-        # Process introduction/summary separately
-        if page.summary:
-            summary_chunks = self.text_splitter.split_text(self._clean_text(page.summary))
-            for summary_chunk in summary_chunks:
-                chunk = self._create_chunk(
-                    content=summary_chunk,
-                    page=page,
-                    section_title="Introduction",
-                    chunk_index=chunk_index,
-                )
-                chunks.append(chunk)
-                chunk_index += 1
-
-        # Process each section
-        for section in page.sections:
-            section_chunks = self._process_section(page, section, chunk_index)
-            chunks.extend(section_chunks)
-            chunk_index += len(section_chunks)
+        # Flatten the section tree, then clean the summary and every
+        # (sub)section together
+        sections = self._iter_sections(page.sections)
+        cleaned_summary, *cleaned_sections = self._clean_text_bulk(
+            [page.summary, *(section.content for section in sections)]
+        )
 
-        return chunks
+        # Split everything up front as (section title, text) pairs; the
+        # introduction keeps all its pieces, sections drop very short ones
+        # (less than 50 characters)
+        split = self._split_text
+        pieces = [("Introduction", text) for text in split(cleaned_summary)]
+        pieces.extend(
+            (section.title, text)
+            for section, cleaned_content in zip(sections, cleaned_sections)
+            for text in split(cleaned_content)
+            if len(text.strip()) >= 50
+        )
 
-    def _process_section(
-        self, page: WikipediaPage, section: WikipediaSection, start_index: int
-    ) -> list[DocumentChunk]:
+        page_metadata = self._page_metadata(page)
+        token_counts = self._count_tokens_batch([text for _, text in pieces])
+        return [
+            self._create_chunk(
+                content=text,
+                page=page,
+                section_title=section_title,
+                chunk_index=chunk_index,
+                page_metadata=page_metadata,
+                token_count=token_count,
+            )
+            for chunk_index, ((section_title, text), token_count) in enumerate(
+                zip(pieces, token_counts)
+            )
+        ]
+
+    def _split_text(self, text: str) -> list[str]:
         """
-        Process a single section and its subsections.
+        Split cleaned text into chunk-sized pieces.
 
-        Args:
-            page: Wikipedia page
-            section: Section to process
-            start_index: Starting chunk index
+        Text that already fits in one chunk is returned as is, skipping the
+        splitter's separator probing (it would return the same single piece).
+        """
+        if len(text) <= self._char_chunk_size:
+            return [text] if text else []
+        return self.text_splitter.split_text(text)
 
-        Returns:
-            List of chunks from this section
+    def _iter_sections(self, sections: list[WikipediaSection]) -> list[WikipediaSection]:
         """
-        chunks = []
-        chunk_index = start_index
-
-        # Clean and split section content
-        cleaned_content = self._clean_text(section.content)
-
-        if cleaned_content:
-            section_chunks = self.text_splitter.split_text(cleaned_content)
-
-            for chunk_text in section_chunks:
-                # Skip very short chunks (less than 50 characters)
-                if len(chunk_text.strip()) < 50:
-                    continue
-
-                chunk = self._create_chunk(
-                    content=chunk_text,
-                    page=page,
-                    section_title=section.title,
-                    chunk_index=chunk_index,
-                )
-                chunks.append(chunk)
-                chunk_index += 1
-
-        # Process subsections recursively
-        for subsection in section.subsections:
-            subsection_chunks = self._process_section(page, subsection, chunk_index)
-            chunks.extend(subsection_chunks)
-            chunk_index += len(subsection_chunks)
+        Flatten a section tree depth-first, each section before its subsections.
 
-        return chunks
+        Walks an explicit stack instead of recursing, so deeply nested
+        articles cost no extra Python frames.
+        """
+        flattened = []
+        stack = list(reversed(sections))
+        while stack:
+            section = stack.pop()
+            flattened.append(section)
+            stack.extend(reversed(section.subsections))
+        return flattened
 
     def _chunk_hybrid(self, page: WikipediaPage, content: str) -> list[DocumentChunk]:
         """
@@ -245,6 +304,8 @@ class DocumentProcessor:
         page: WikipediaPage,
         section_title: Optional[str],
         chunk_index: int,
+        page_metadata: Optional[dict[str, str]] = None,
+        token_count: Optional[int] = None,
     ) -> DocumentChunk:
         """
         Create a DocumentChunk with proper metadata.
@@ -254,22 +315,25 @@ class DocumentProcessor:
             page: Source Wikipedia page
             section_title: Section this chunk belongs to
             chunk_index: Index of this chunk in the document
+            page_metadata: Page-level metadata from _page_metadata(), built
+                once per page by callers creating many chunks
+            token_count: Precomputed token count from _count_tokens_batch();
+                counted here if omitted
 
         Returns:
             DocumentChunk object
         """
-        # Generate unique chunk ID
-        chunk_id = self._generate_chunk_id(page.title, chunk_index)
+        chunk_id = DocumentChunk.make_id(content, source_url=page.url, idx=chunk_index)
 
-        # Estimate token count (rough approximation: 1 token ≈ 4 characters)
-        token_count = len(content) // 4
+        if token_count is None:
+            token_count = self._count_tokens(content)
 
-        # Build metadata
+        # Build metadata on top of the page-level fields
+        if page_metadata is None:
+            page_metadata = self._page_metadata(page)
         metadata = {
-            "page_title": page.title,
-            "page_url": page.url,
+            **page_metadata,
             "section": section_title or "Introduction",
-            "language": page.language,
             "chunk_index": str(chunk_index),
         }
 
@@ -284,20 +348,37 @@ class DocumentProcessor:
             token_count=token_count,
         )
 
-    def _generate_chunk_id(self, page_title: str, chunk_index: int) -> str:
+    def _count_tokens(self, text: str) -> int:
         """
-        Generate a unique chunk ID.
+        Count the tokens in a chunk.
 
-        Args:
-            page_title: Wikipedia page title
-            chunk_index: Chunk index
+        Exact when the processor has a tokenizer (special tokens excluded);
+        otherwise a rough approximation of 1 token per 4 characters.
+        """
+        if self.tokenizer is None:
+            return len(text) // 4
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
 
-        Returns:
-            Unique chunk ID
+    def _count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """
+        Count the tokens of a page's chunks at once.
+
+        A fast tokenizer encodes the whole batch in one call, in parallel
+        in its Rust backend, instead of one call per chunk.
         """
-        # Create a hash from page title for uniqueness
-        title_hash = hashlib.md5(page_title.encode()).hexdigest()[:8]
-        return f"{title_hash}_{chunk_index:04d}"
+        if self.tokenizer is None or not texts:
+            return [len(text) // 4 for text in texts]
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    @staticmethod
+    def _page_metadata(page: WikipediaPage) -> dict[str, str]:
+        """Metadata shared by every chunk of a page."""
+        return {
+            "page_title": page.title,
+            "page_url": page.url,
+            "language": page.language,
+        }
 
     def get_chunk_stats(self, chunks: list[DocumentChunk]) -> dict:
         """
@@ -319,16 +400,19 @@ class DocumentProcessor:
                 "avg_tokens_per_chunk": 0,
             }
 
-        chunk_sizes = [len(chunk.content) for chunk in chunks]
-        token_counts = [chunk.token_count or 0 for chunk in chunks]
+        count = len(chunks)
+        chunk_sizes = np.fromiter((len(chunk.content) for chunk in chunks), np.int64, count)
+        token_counts = np.fromiter((chunk.token_count or 0 for chunk in chunks), np.int64, count)
+        total_size = int(chunk_sizes.sum())
+        total_tokens = int(token_counts.sum())
 
         return {
-            "total_chunks": len(chunks),
-            "avg_chunk_size": sum(chunk_sizes) // len(chunk_sizes),
-            "min_chunk_size": min(chunk_sizes),
-            "max_chunk_size": max(chunk_sizes),
-            "total_tokens": sum(token_counts),
-            "avg_tokens_per_chunk": sum(token_counts) // len(token_counts),
+            "total_chunks": count,
+            "avg_chunk_size": total_size // count,
+            "min_chunk_size": int(chunk_sizes.min()),
+            "max_chunk_size": int(chunk_sizes.max()),
+            "total_tokens": total_tokens,
+            "avg_tokens_per_chunk": total_tokens // count,
         }
 
 
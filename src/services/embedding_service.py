@@ -4,8 +4,14 @@ Embedding service for generating vector embeddings from text.
 Uses sentence-transformers for local embedding generation.
 """
 
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
 from typing import Optional
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from src.models.schemas import DocumentChunk, EmbeddingConfig
@@ -22,6 +28,15 @@ class EmbeddingService:
     Supports batch processing and different embedding models.
     """
 
+    # Chunks encoded per step of embed_chunks_streaming
+    STREAM_BATCH_SIZE = 256
+
+    # Embeddings kept by text across pages and queries (~1.5 KB each at 384 dims)
+    EMBEDDING_CACHE_SIZE = 20_000
+
+    # Seconds aembed_text waits to gather concurrent requests into one batch
+    MICRO_BATCH_WINDOW = 0.002
+
     def __init__(self, config: Optional[EmbeddingConfig] = None):
         """
         Initialize the embedding service.
@@ -41,6 +56,14 @@ class EmbeddingService:
         self.config = config
         self.model: SentenceTransformer = None
         self.embedding_dimension: Optional[int] = None
+        self._load_lock = threading.Lock()
+
+        # text digest -> float32 embedding, least recently used first
+        self._embedding_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+
+        # Texts awaiting the next micro-batch, per event loop (see aembed_text)
+        self._pending_texts: dict[asyncio.AbstractEventLoop, list[tuple[str, asyncio.Future]]] = {}
 
         logger.info(
             f"Embedding service initialized with model: {self.config.model_name}, "
@@ -48,31 +71,62 @@ class EmbeddingService:
         )
 
     def load_model(self) -> None:
-        """Load the sentence-transformer model."""
+        """
+        Load the sentence-transformer model.
+
+        Safe to call from several threads: callers block until an in-progress
+        load (e.g. one started by load_model_in_background) has finished.
+        """
         if self.model is not None:
             logger.debug("Model already loaded")
             return
 
-        try:
-            logger.info(f"Loading embedding model: {self.config.model_name}")
+        with self._load_lock:
+            if self.model is not None:
+                return
 
-            self.model = SentenceTransformer(
-                self.config.model_name,
-                device=self.config.device,
-            )
+            try:
+                logger.info(f"Loading embedding model: {self.config.model_name}")
 
-            # Get embedding dimension
-            self.embedding_dimension = self.model.get_sentence_embedding_dimension()
+                model = SentenceTransformer(
+                    self.config.model_name,
+                    device=self.config.device,
+                )
 
-            logger.info(
-                f"Model loaded successfully. Embedding dimension: {self.embedding_dimension}"
-            )
+                # Get embedding dimension
+                self.embedding_dimension = model.get_sentence_embedding_dimension()
+                self.model = model
 
-        except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}", exc_info=True)
-            raise RuntimeError(f"Failed to load embedding model: {e}") from e
+                logger.info(
+                    f"Model loaded successfully. Embedding dimension: {self.embedding_dimension}"
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to load embedding model: {e}", exc_info=True)
+                raise RuntimeError(f"Failed to load embedding model: {e}") from e
+
+    def load_model_in_background(self) -> threading.Thread:
+        """
+        Start loading the model on a daemon thread.
+
+        Lets model loading overlap with other startup work (e.g. fetching a
+        page). Any later call that needs the model waits for this load to
+        finish; if it fails, the next call retries and raises the error.
+
+        Returns:
+            The loader thread
+        """
+        def _load() -> None:
+            try:
+                self.load_model()
+            except RuntimeError:
+                pass  # Already logged; retried by the next caller
+
+        loader = threading.Thread(target=_load, name="embedding-model-loader", daemon=True)
+        loader.start()
+        return loader
 
-    def embed_text(self, text: str) -> list[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
 
@@ -80,8 +134,13 @@ class EmbeddingService:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            float32 embedding vector of shape (dimension,)
         """
+        key = self._cache_key(text)
+        cached = self._get_cached_embeddings([key])[0]
+        if cached is not None:
+            return cached.copy()
+
         if self.model is None:
             self.load_model()
 
@@ -92,13 +151,65 @@ class EmbeddingService:
                 convert_to_numpy=True,
             )
 
-            return embedding.tolist()
+            embedding = np.asarray(embedding, dtype=np.float32)
+            self._set_cached_embeddings([key], embedding.reshape(1, -1))
+            return embedding
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}", exc_info=True)
             raise RuntimeError(f"Failed to generate embedding: {e}") from e
 
-    def embed_texts(self, texts: list[str], show_progress: bool = True) -> list[list[float]]:
+    async def aembed_text(self, text: str) -> np.ndarray:
+        """
+        Generate embedding for a single text without blocking the event loop.
+
+        Concurrent calls on the same event loop within MICRO_BATCH_WINDOW
+        are coalesced into one embed_texts() batch on a worker thread, so
+        many simultaneous queries cost one model call instead of one each.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            float32 embedding vector of shape (dimension,)
+        """
+        cached = self._get_cached_embeddings([self._cache_key(text)])[0]
+        if cached is not None:
+            return cached.copy()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending_texts.setdefault(loop, [])
+        if not pending:
+            # First request of a new batch: flush once the window closes
+            loop.call_later(self.MICRO_BATCH_WINDOW, self._flush_pending_texts, loop)
+        pending.append((text, future))
+
+        return await future
+
+    def _flush_pending_texts(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Embed one event loop's pending texts as a batch and resolve their futures."""
+        batch = self._pending_texts.pop(loop)
+        texts = [text for text, _ in batch]
+        logger.debug(f"Embedding micro-batch of {len(texts)} texts")
+
+        embedded = loop.run_in_executor(None, self.embed_texts, texts, False)
+
+        def resolve(done: asyncio.Future) -> None:
+            for row, (_, future) in enumerate(batch):
+                if future.done():  # caller was cancelled
+                    continue
+                if done.cancelled():
+                    future.cancel()
+                elif done.exception() is not None:
+                    future.set_exception(done.exception())
+                else:
+                    future.set_result(done.result()[row])
+
+        embedded.add_done_callback(resolve)
+
+    def embed_texts(self, texts: list[str], show_progress: bool = True) -> np.ndarray:
         """
         Generate embeddings for multiple texts (batch processing).
 
@@ -107,50 +218,146 @@ class EmbeddingService:
             show_progress: Whether to show progress bar
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension), one row per text
+        """
+        if not texts:
+            logger.warning("No texts provided for embedding")
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        return self._encode_batch(texts, show_progress=show_progress)
+
+    def embed_chunks(self, chunks: list[DocumentChunk], show_progress: bool = True) -> np.ndarray:
+        """
+        Generate embeddings for document chunks.
+
+        Embeddings are kept as a contiguous float32 matrix so they can be
+        handed to the vector database without boxing every value.
+
+        Args:
+            chunks: List of DocumentChunk objects
+            show_progress: Whether to show progress bar
+
+        Returns:
+            Array of shape (len(chunks), dimension) matching chunk order
+        """
+        if not chunks:
+            logger.warning("No texts provided for embedding")
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        texts = [chunk.content for chunk in chunks]
+        return self._encode_batch(texts, show_progress=show_progress)
+
+    def embed_chunks_streaming(
+        self, chunks: list[DocumentChunk], batch_size: Optional[int] = None
+    ) -> Iterator[tuple[list[DocumentChunk], np.ndarray]]:
+        """
+        Embed chunks batch by batch, yielding each batch as soon as it is encoded.
+
+        Lets callers store one batch while the next is being encoded, instead
+        of holding every embedding until the whole page is done.
+
+        Args:
+            chunks: List of DocumentChunk objects
+            batch_size: Chunks per batch (default: STREAM_BATCH_SIZE)
+
+        Yields:
+            (chunk batch, embeddings for that batch as in embed_chunks())
+        """
+        if batch_size is None:
+            batch_size = self.STREAM_BATCH_SIZE
+
+        for start in range(0, len(chunks), batch_size):
+            chunk_batch = chunks[start : start + batch_size]
+            yield chunk_batch, self.embed_chunks(chunk_batch, show_progress=False)
+
+    def _encode_batch(self, texts: list[str], show_progress: bool) -> np.ndarray:
+        """
+        Encode a non-empty batch of texts into a float32 matrix.
+
+        Identical texts (e.g. boilerplate repeated across sections) are sent
+        to the model once and their embedding is copied to every position.
+        Texts embedded before (on any page) are taken from the embedding
+        cache instead of the model.
         """
         if self.model is None:
             self.load_model()
 
-        if not texts:
-            logger.warning("No texts provided for embedding")
-            return []
+        # Map each text to the row of its first occurrence
+        first_row: dict[str, int] = {}
+        inverse = [first_row.setdefault(text, len(first_row)) for text in texts]
+        unique_texts = list(first_row)
 
-        try:
-            logger.info(f"Generating embeddings for {len(texts)} texts")
+        keys = [self._cache_key(text) for text in unique_texts]
+        cached = self._get_cached_embeddings(keys)
+        misses = [row for row, embedding in enumerate(cached) if embedding is None]
 
-            embeddings = self.model.encode(
-                texts,
-                batch_size=self.config.batch_size,
-                normalize_embeddings=self.config.normalize_embeddings,
-                show_progress_bar=show_progress,
-                convert_to_numpy=True,
+        try:
+            logger.info(
+                f"Generating embeddings for {len(misses)} texts "
+                f"({len(texts) - len(unique_texts)} duplicates skipped, "
+                f"{len(unique_texts) - len(misses)} cached)"
             )
 
-            # Convert to list of lists
-            logger.info(f"Generated {embeddings.shape} embeddings")
+            embeddings = np.empty((len(unique_texts), self.embedding_dimension), dtype=np.float32)
+            for row, embedding in enumerate(cached):
+                if embedding is not None:
+                    embeddings[row] = embedding
+
+            if misses:
+                encoded = self.model.encode(
+                    [unique_texts[row] for row in misses],
+                    batch_size=self.config.batch_size,
+                    normalize_embeddings=self.config.normalize_embeddings,
+                    show_progress_bar=show_progress,
+                    convert_to_numpy=True,
+                )
+                logger.info(f"Generated {encoded.shape} embeddings")
+
+                embeddings[misses] = encoded
+                self._set_cached_embeddings([keys[row] for row in misses], embeddings[misses])
 
-            return embeddings.tolist()
+            if len(unique_texts) < len(texts):
+                embeddings = embeddings[inverse]
+            return embeddings
 
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}", exc_info=True)
             raise RuntimeError(f"Failed to generate embeddings: {e}") from e
 
-    def embed_chunks(
-        self, chunks: list[DocumentChunk], show_progress: bool = True
-    ) -> list[list[float]]:
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Compact, fixed-size embedding cache key for a text."""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _get_cached_embeddings(self, keys: list[bytes]) -> list[Optional[np.ndarray]]:
+        """Look up cached embeddings (None for misses), refreshing the hits."""
+        with self._embedding_cache_lock:
+            found = [self._embedding_cache.get(key) for key in keys]
+            for key, embedding in zip(keys, found):
+                if embedding is not None:
+                    self._embedding_cache.move_to_end(key)
+        return found
+
+    def _set_cached_embeddings(self, keys: list[bytes], embeddings: np.ndarray) -> None:
+        """Cache embeddings, evicting the least recently used beyond EMBEDDING_CACHE_SIZE."""
+        with self._embedding_cache_lock:
+            for key, embedding in zip(keys, embeddings):
+                self._embedding_cache[key] = np.array(embedding, dtype=np.float32)
+                self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+
+    def get_tokenizer(self):
         """
-        Generate embeddings for document chunks.
-
-        Args:
-            chunks: List of DocumentChunk objects
-            show_progress: Whether to show progress bar
+        Get the model's Hugging Face tokenizer (loads the model if needed).
 
         Returns:
-            List of embedding vectors matching chunk order
+            The tokenizer the model encodes text with
         """
-        texts = [chunk.content for chunk in chunks]
-        return self.embed_texts(texts, show_progress=show_progress)
+        if self.model is None:
+            self.load_model()
+
+        return self.model.tokenizer
 
     def get_embedding_dimension(self) -> int:
         """
@@ -168,12 +375,16 @@ class EmbeddingService:
 
 # Global instance cache
 _embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
 
 
 def get_embedding_service(config: Optional[EmbeddingConfig] = None) -> EmbeddingService:
     """
     Get or create the global embedding service instance.
 
+    Safe to call from several threads: exactly one instance is created,
+    and its model is loaded once (load_model serializes concurrent callers).
+
     Args:
         config: Optional embedding configuration
 
@@ -182,14 +393,19 @@ def get_embedding_service(config: Optional[EmbeddingConfig] = None) -> Embedding
     """
     global _embedding_service
 
-    if _embedding_service is None:
-        _embedding_service = EmbeddingService(config=config)
-        _embedding_service.load_model()
+    service = _embedding_service
+    if service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService(config=config)
+            service = _embedding_service
 
-    return _embedding_service
+    service.load_model()
+    return service
 
 
 def reset_embedding_service() -> None:
     """Reset the global embedding service instance (useful for testing)."""
     global _embedding_service
-    _embedding_service = None
+    with _embedding_service_lock:
+        _embedding_service = None
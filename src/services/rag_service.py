@@ -5,14 +5,19 @@ Coordinates Wikipedia scraping, document processing, embedding generation,
 vector storage, similarity search, and LLM response generation.
 """
 
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from src.adapters.chroma_adapter import ChromaAdapter
 from src.adapters.llm_adapter import LLMAdapter
 from src.adapters.lmstudio_adapter import LMStudioAdapter
+from src.adapters.vectordb_adapter import Embedding, VectorDBAdapter
 from src.models.schemas import DocumentChunk, QueryResult
 from src.services.document_processor import DocumentProcessor
 from src.services.embedding_service import EmbeddingService
+from src.services.response_cache import SemanticResponseCache
 from src.services.wikipedia_scraper import WikipediaScraper
 from src.utils.config import get_settings
 from src.utils.logger import get_logger
@@ -31,23 +36,29 @@ class RAGService:
     def __init__(
         self,
         llm_adapter: Optional[LLMAdapter] = None,
-        vector_db: Optional[ChromaAdapter] = None,
+        vector_db: Optional[VectorDBAdapter] = None,
         embedding_service: Optional[EmbeddingService] = None,
+        response_cache: Optional[SemanticResponseCache] = None,
     ):
         """
         Initialize RAG service with components.
 
         Args:
             llm_adapter: LLM adapter (default: LMStudio)
-            vector_db: Vector database adapter (default: Chroma)
+            vector_db: Vector database adapter (default: from VECTOR_DB setting)
             embedding_service: Embedding service (default: sentence-transformers)
+            response_cache: Semantic cache of LLM answers (default: one backed by
+                vector_db, unless LLM_CACHE_ENABLED is false)
         """
         self.settings = get_settings()
 
         # Initialize components
         self.llm = llm_adapter or LMStudioAdapter()
-        self.vector_db = vector_db or ChromaAdapter()
+        self.vector_db = vector_db or self._default_vector_db()
         self.embedding_service = embedding_service or EmbeddingService()
+        self.response_cache = response_cache
+        if self.response_cache is None and self.settings.llm_cache_enabled:
+            self.response_cache = SemanticResponseCache(self.vector_db)
 
         # Initialize other services
         self.scraper = WikipediaScraper()
@@ -60,27 +71,49 @@ class RAGService:
         # Connect to services
         self._initialize_services()
 
+        # Size chunks with the embedding model's own tokenizer (needs the
+        # model, loaded above)
+        if self.settings.chunk_by_tokens:
+            self.processor = DocumentProcessor(tokenizer=self.embedding_service.get_tokenizer())
+
         logger.info("RAG service initialized")
 
+    def _default_vector_db(self) -> VectorDBAdapter:
+        """Create the vector database adapter selected by settings."""
+        if self.settings.vector_db == "faiss":
+            from src.adapters.faiss_adapter import FaissAdapter
+
+            return FaissAdapter()
+
+        return ChromaAdapter()
+
     def _initialize_services(self) -> None:
         """Initialize and connect to external services."""
         try:
+            # Start loading the embedding model so it overlaps with connecting
+            # to the vector DB and probing the LLM
+            needs_model = (
+                not hasattr(self.embedding_service, "model") or self.embedding_service.model is None
+            )
+            if needs_model:
+                self.embedding_service.load_model_in_background()
+
             # Initialize vector DB
             if not hasattr(self.vector_db, "client") or self.vector_db.client is None:
                 self.vector_db.initialize()
                 logger.info("Vector database connected")
 
-            # Load embedding model
-            if not hasattr(self.embedding_service, "model") or self.embedding_service.model is None:
-                self.embedding_service.load_model()
-                logger.info("Embedding model loaded")
-
             # Check LLM availability
             if self.llm.is_available():
                 logger.info("LLM service available")
             else:
                 logger.warning("LLM service not available - responses will fail")
 
+            # Wait for the embedding model (re-raises if the load failed)
+            if needs_model:
+                self.embedding_service.load_model()
+                logger.info("Embedding model loaded")
+
         except Exception as e:
             logger.error(f"Failed to initialize services: {e}", exc_info=True)
             raise
@@ -106,11 +139,7 @@ class RAGService:
             chunks = self.processor.process_page(page)
             logger.info(f"Processed into {len(chunks)} chunks")
 
-            # 3. Generate embeddings
-            embeddings = self.embedding_service.embed_chunks(chunks, show_progress=True)
-            logger.info(f"Generated {len(embeddings)} embeddings")
-
-            # 4. Store in vector database
+            # 3. Prepare the vector database collection
             collection_name = self.vector_db.get_default_collection_name(page.title)
 
             # Clear existing collection if it exists
@@ -118,8 +147,18 @@ class RAGService:
                 logger.info(f"Clearing existing collection: {collection_name}")
                 self.vector_db.delete_collection(collection_name)
 
-            self.vector_db.store_documents(collection_name, chunks, embeddings)
-            logger.info(f"Stored in collection: {collection_name}")
+            # Answers cached for an older copy of the page may be stale
+            if self.response_cache is not None:
+                self.response_cache.invalidate(collection_name)
+
+            # 4. Generate embeddings and store them, overlapping the two
+            embed_and_store(self.embedding_service, self.vector_db, collection_name, chunks)
+            logger.info(f"Stored {len(chunks)} embeddings in collection: {collection_name}")
+
+            # Keep the index cold-start off the first user query
+            self.vector_db.warmup(
+                collection_name, self.embedding_service.get_embedding_dimension()
+            )
 
             # Update current state
             self.current_page_title = page.title
@@ -150,6 +189,7 @@ class RAGService:
         k: int = 5,
         min_similarity: float = 0.0,
         include_context: bool = True,
+        query_embedding: Optional[Embedding] = None,
     ) -> QueryResult:
         """
         Answer a question using RAG.
@@ -159,6 +199,7 @@ class RAGService:
             k: Number of chunks to retrieve
             min_similarity: Minimum similarity threshold
             include_context: Whether to include full context in result
+            query_embedding: Precomputed embedding of the question (skips re-embedding)
 
         Returns:
             QueryResult with answer and retrieved context
@@ -170,8 +211,9 @@ class RAGService:
 
         try:
             # 1. Generate query embedding
-            query_embedding = self.embedding_service.embed_text(question)
-            logger.debug("Generated query embedding")
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(question)
+                logger.debug("Generated query embedding")
 
             # 2. Retrieve relevant chunks
             results = self.vector_db.similarity_search(
@@ -182,63 +224,312 @@ class RAGService:
             logger.info(f"Retrieved {len(results)} chunks")
 
             # Filter by similarity threshold
-            filtered_results = [
-                (chunk, score) for chunk, score in results if score >= min_similarity
-            ]
+            chunks, scores = self._filter_results(results, min_similarity)
 
-            if not filtered_results:
+            if not chunks:
                 logger.warning("No results above similarity threshold")
-                return QueryResult(
+                return self._no_context_result(question, k, min_similarity)
+
+            # 3. Reuse the answer to a similar question, if one is cached
+            response = self._cached_response(query_embedding, k, min_similarity)
+            if response is None:
+                # 4. Assemble context and generate response with LLM
+                context = self._assemble_context(chunks)
+                logger.debug(f"Assembled context: {len(context)} characters")
+
+                response = self.llm.generate_with_context(
                     query=question,
-                    retrieved_chunks=[],
-                    similarity_scores=[],
-                    context="No relevant context found.",
-                    metadata={
-                        "page_title": self.current_page_title,
-                        "k": k,
-                        "min_similarity": min_similarity,
-                    },
+                    context=context,
+                    temperature=self.settings.llm_temperature,
+                    max_tokens=self.settings.llm_max_tokens,
                 )
+                logger.info("Generated LLM response")
+                self._cache_response(question, query_embedding, response, k, min_similarity)
+
+            return self._build_result(
+                question, chunks, scores, response, k, min_similarity, include_context
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to process query: {e}", exc_info=True)
+            raise
+
+    def retrieve_many(
+        self,
+        questions: list[str],
+        k: int = 5,
+        min_similarity: float = 0.0,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """
+        Retrieve context for several questions without calling the LLM.
+
+        Questions are embedded as one batch and searched with a single
+        vector database request, e.g. for sub-questions or evaluation runs.
+
+        Args:
+            questions: User questions
+            k: Number of chunks to retrieve per question
+            min_similarity: Minimum similarity threshold
+
+        Returns:
+            One list of (DocumentChunk, similarity_score) tuples per question
+        """
+        if not self.current_collection:
+            raise ValueError("No Wikipedia page loaded. Call load_wikipedia_page() first.")
+
+        if not questions:
+            return []
+
+        query_embeddings = self.embedding_service.embed_texts(questions, show_progress=False)
+        results = self.vector_db.similarity_search_many(
+            self.current_collection,
+            query_embeddings,
+            k=k,
+        )
+        logger.info(f"Retrieved context for {len(questions)} questions")
+
+        return [
+            [(chunk, score) for chunk, score in hits if score >= min_similarity]
+            for hits in results
+        ]
+
+    async def aquery_many(
+        self,
+        questions: list[str],
+        k: int = 5,
+        min_similarity: float = 0.0,
+        include_context: bool = True,
+        concurrency: int = 4,
+    ) -> list[QueryResult]:
+        """
+        Answer several questions with batched retrieval and concurrent LLM calls.
+
+        Retrieval for all questions is one embedding batch and one vector
+        database request; the LLM calls then run concurrently, at most
+        ``concurrency`` in flight at a time.
+
+        Args:
+            questions: User questions
+            k: Number of chunks to retrieve per question
+            min_similarity: Minimum similarity threshold
+            include_context: Whether to include full context in results
+            concurrency: Maximum number of simultaneous LLM requests
+
+        Returns:
+            One QueryResult per question, in question order
+        """
+        retrieved = await asyncio.to_thread(self.retrieve_many, questions, k, min_similarity)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def answer(
+            question: str, filtered_results: list[tuple[DocumentChunk, float]]
+        ) -> QueryResult:
+            if not filtered_results:
+                return self._no_context_result(question, k, min_similarity)
 
-            # 3. Assemble context
             chunks = [chunk for chunk, _ in filtered_results]
             scores = [score for _, score in filtered_results]
-
             context = self._assemble_context(chunks)
-            logger.debug(f"Assembled context: {len(context)} characters")
-
-            # 4. Generate response with LLM
-            response = self.llm.generate_with_context(
-                query=question,
-                context=context,
-                temperature=self.settings.llm_temperature,
-                max_tokens=self.settings.llm_max_tokens,
+
+            async with semaphore:
+                response = await self.llm.agenerate_with_context(
+                    query=question,
+                    context=context,
+                    temperature=self.settings.llm_temperature,
+                    max_tokens=self.settings.llm_max_tokens,
+                )
+
+            return self._build_result(
+                question, chunks, scores, response, k, min_similarity, include_context
             )
-            logger.info("Generated LLM response")
-
-            # 5. Add citations to response
-            response_with_citations = self._add_citations(response, chunks)
-
-            # Build result
-            query_result = QueryResult(
-                query=question,
-                retrieved_chunks=chunks if include_context else [],
-                similarity_scores=scores,
-                context=response_with_citations,
-                metadata={
-                    "page_title": self.current_page_title,
-                    "k": k,
-                    "min_similarity": min_similarity,
-                    "num_results": len(filtered_results),
-                },
+
+        return await asyncio.gather(
+            *(answer(question, hits) for question, hits in zip(questions, retrieved))
+        )
+
+    async def aquery(
+        self,
+        question: str,
+        k: int = 5,
+        min_similarity: float = 0.0,
+        include_context: bool = True,
+        query_embedding: Optional[Embedding] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> QueryResult:
+        """
+        Async variant of query() for answering several questions concurrently.
+
+        Embedding and vector search run in worker threads and the answer is
+        generated with the LLM adapter's async client, so the event loop is
+        free while a question waits on the LLM and several aquery() calls
+        awaited together (e.g. with asyncio.gather) overlap.
+
+        Args:
+            question: User question
+            k: Number of chunks to retrieve
+            min_similarity: Minimum similarity threshold
+            include_context: Whether to include full context in result
+            query_embedding: Precomputed embedding of the question (skips re-embedding)
+            on_token: Optional callback; when given, the answer is streamed and
+                each text delta is passed to it as it arrives
+
+        Returns:
+            QueryResult with answer and retrieved context
+        """
+        if not self.current_collection:
+            raise ValueError("No Wikipedia page loaded. Call load_wikipedia_page() first.")
+
+        logger.info(f"Processing query: {question}")
+
+        try:
+            if query_embedding is None:
+                query_embedding = await self.embedding_service.aembed_text(question)
+
+            results = await asyncio.to_thread(
+                self.vector_db.similarity_search,
+                self.current_collection,
+                query_embedding,
+                k=k,
             )
+            logger.info(f"Retrieved {len(results)} chunks")
+
+            chunks, scores = self._filter_results(results, min_similarity)
+
+            if not chunks:
+                logger.warning("No results above similarity threshold")
+                return self._no_context_result(question, k, min_similarity)
 
-            return query_result
+            response = await asyncio.to_thread(
+                self._cached_response, query_embedding, k, min_similarity
+            )
+            if response is not None:
+                if on_token is not None:
+                    on_token(response)
+            else:
+                context = self._assemble_context(chunks)
+                if on_token is None:
+                    response = await self.llm.agenerate_with_context(
+                        query=question,
+                        context=context,
+                        temperature=self.settings.llm_temperature,
+                        max_tokens=self.settings.llm_max_tokens,
+                    )
+                else:
+                    parts = []
+                    async for delta in self.llm.astream_with_context(
+                        query=question,
+                        context=context,
+                        temperature=self.settings.llm_temperature,
+                        max_tokens=self.settings.llm_max_tokens,
+                    ):
+                        parts.append(delta)
+                        on_token(delta)
+                    response = "".join(parts)
+                logger.info("Generated LLM response")
+                await asyncio.to_thread(
+                    self._cache_response, question, query_embedding, response, k, min_similarity
+                )
+
+            return self._build_result(
+                question, chunks, scores, response, k, min_similarity, include_context
+            )
 
         except Exception as e:
             logger.error(f"Failed to process query: {e}", exc_info=True)
             raise
 
+    def _cached_response(
+        self, query_embedding: Embedding, k: int, min_similarity: float
+    ) -> Optional[str]:
+        """Answer cached for a similar question about the current page, if any."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.lookup(
+            self.current_collection, query_embedding, self._cache_key(k, min_similarity)
+        )
+
+    def _cache_response(
+        self,
+        question: str,
+        query_embedding: Embedding,
+        response: str,
+        k: int,
+        min_similarity: float,
+    ) -> None:
+        """Remember an LLM answer for similar questions about the current page."""
+        if self.response_cache is not None:
+            self.response_cache.store(
+                self.current_collection,
+                question,
+                query_embedding,
+                response,
+                self._cache_key(k, min_similarity),
+            )
+
+    def _cache_key(self, k: int, min_similarity: float) -> str:
+        """Response cache key for the current LLM settings and retrieval parameters."""
+        return SemanticResponseCache.request_key(
+            getattr(self.llm, "model", type(self.llm).__name__),
+            self.settings.llm_temperature,
+            self.settings.llm_max_tokens,
+            k,
+            min_similarity,
+        )
+
+    def _no_context_result(self, question: str, k: int, min_similarity: float) -> QueryResult:
+        """Result returned when no chunk passes the similarity threshold."""
+        return QueryResult(
+            query=question,
+            retrieved_chunks=[],
+            similarity_scores=[],
+            context="No relevant context found.",
+            metadata={
+                "page_title": self.current_page_title,
+                "k": k,
+                "min_similarity": min_similarity,
+            },
+        )
+
+    @staticmethod
+    def _filter_results(
+        results: list[tuple[DocumentChunk, float]], min_similarity: float
+    ) -> tuple[list[DocumentChunk], list[float]]:
+        """Split the results passing the similarity threshold into chunks and scores."""
+        chunks: list[DocumentChunk] = []
+        scores: list[float] = []
+        for chunk, score in results:
+            if score >= min_similarity:
+                chunks.append(chunk)
+                scores.append(score)
+        return chunks, scores
+
+    def _build_result(
+        self,
+        question: str,
+        chunks: list[DocumentChunk],
+        scores: list[float],
+        response: str,
+        k: int,
+        min_similarity: float,
+        include_context: bool,
+    ) -> QueryResult:
+        """Attach citations to an LLM response and wrap it in a QueryResult."""
+        # Add citations to response
+        response_with_citations = self._add_citations(response, chunks)
+
+        return QueryResult(
+            query=question,
+            retrieved_chunks=chunks if include_context else [],
+            similarity_scores=scores,
+            context=response_with_citations,
+            metadata={
+                "page_title": self.current_page_title,
+                "k": k,
+                "min_similarity": min_similarity,
+                "num_results": len(chunks),
+            },
+        )
+
     def _assemble_context(self, chunks: list[DocumentChunk]) -> str:
         """
         Assemble context from retrieved chunks.
@@ -249,13 +540,10 @@ class RAGService:
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        for idx, chunk in enumerate(chunks, 1):
-            section = chunk.section_title or "Introduction"
-            context_parts.append(f"[{idx}] Section: {section}\n{chunk.content}\n")
-
-        return "\n".join(context_parts)
+        return "\n".join(
+            f"[{idx}] Section: {chunk.section_title or 'Introduction'}\n{chunk.content}\n"
+            for idx, chunk in enumerate(chunks, 1)
+        )
 
     def _add_citations(self, response: str, chunks: list[DocumentChunk]) -> str:
         """
@@ -268,15 +556,11 @@ class RAGService:
         Returns:
             Response with citations appended
         """
-        # Build citations
-        citations = []
-        seen_sections = set()
-
-        for chunk in chunks:
-            section = chunk.section_title or "Introduction"
-            if section not in seen_sections:
-                citations.append(f"- {section} ({chunk.source_url})")
-                seen_sections.add(section)
+        # One citation per (section, URL), in first-retrieved order
+        sources = dict.fromkeys(
+            (chunk.section_title or "Introduction", chunk.source_url) for chunk in chunks
+        )
+        citations = [f"- {section} ({url})" for section, url in sources]
 
         if citations:
             citation_text = "\n\n**Sources:**\n" + "\n".join(citations)
@@ -289,6 +573,8 @@ class RAGService:
         if self.current_collection:
             logger.info(f"Clearing collection: {self.current_collection}")
             self.vector_db.delete_collection(self.current_collection)
+            if self.response_cache is not None:
+                self.response_cache.invalidate(self.current_collection)
 
         self.current_page_title = None
         self.current_collection = None
@@ -323,3 +609,43 @@ def get_rag_service() -> RAGService:
         Initialized RAGService
     """
     return RAGService()
+
+
+def embed_and_store(
+    embedding_service: EmbeddingService,
+    vector_db: VectorDBAdapter,
+    collection_name: str,
+    chunks: list[DocumentChunk],
+    on_batch_processed: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Embed chunks in batches, storing each batch while the next is encoded.
+
+    A single writer thread keeps batches in order; at most one batch
+    waits for storage at a time. Storage errors are re-raised here. The
+    collection is flushed once all batches are stored.
+
+    Args:
+        embedding_service: Service that embeds the chunks
+        vector_db: Vector database to store into
+        collection_name: Collection to store into
+        chunks: Chunks to embed and store
+        on_batch_processed: Optional callback passed to store_documents,
+            invoked with the number of chunks written
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vectordb-store") as writer:
+        pending = None
+        for chunk_batch, embedding_batch in embedding_service.embed_chunks_streaming(chunks):
+            if pending is not None:
+                pending.result()
+            pending = writer.submit(
+                vector_db.store_documents,
+                collection_name,
+                chunk_batch,
+                embedding_batch,
+                on_batch_processed=on_batch_processed,
+            )
+        if pending is not None:
+            pending.result()
+
+    vector_db.flush(collection_name)
@@ -0,0 +1,169 @@
+"""
+Semantic response cache for RAG answers.
+
+Stores LLM answers in the vector database, keyed by the question's
+embedding, so a repeated or paraphrased question about the same page is
+answered with a millisecond vector lookup instead of a multi-second LLM call.
+"""
+
+import time
+import uuid
+from typing import Optional
+
+from src.adapters.vectordb_adapter import Embedding, VectorDBAdapter, VectorDBError
+from src.models.schemas import DocumentChunk
+from src.utils.config import get_settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticResponseCache:
+    """
+    Cache of LLM answers looked up by question similarity.
+
+    Each page's answers live in their own collection (``llm_cache_<collection>``)
+    of the configured vector database: the question is stored as the
+    document, its embedding as the vector, and the answer, timestamp and
+    request key as metadata. A lookup hits when the nearest cached question
+    has the same request key (see request_key()), scores at least
+    ``min_similarity`` and is younger than ``ttl_seconds``.
+
+    Cache failures are logged and treated as misses; they never fail a query.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDBAdapter,
+        min_similarity: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            vector_db: Vector database adapter holding the cache collections
+            min_similarity: Minimum similarity score for a hit (default: from settings)
+            ttl_seconds: Age after which cached answers are ignored (default: from settings)
+        """
+        settings = get_settings()
+        self.vector_db = vector_db
+        self.min_similarity = (
+            settings.llm_cache_min_similarity if min_similarity is None else min_similarity
+        )
+        self.ttl_seconds = settings.llm_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+
+    @staticmethod
+    def collection_name(page_collection: str) -> str:
+        """Name of the cache collection for a page's collection."""
+        return f"llm_cache_{page_collection}"
+
+    @staticmethod
+    def request_key(
+        model: str, temperature: float, max_tokens: int, k: int, min_similarity: float
+    ) -> str:
+        """
+        Identify everything besides the question that shapes an answer.
+
+        Args:
+            model: LLM model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens generated
+            k: Number of chunks retrieved
+            min_similarity: Retrieval similarity threshold
+
+        Returns:
+            Key that cached answers must match exactly
+        """
+        return f"{model}|{temperature}|{max_tokens}|{k}|{min_similarity}"
+
+    def lookup(
+        self, page_collection: str, query_embedding: Embedding, request_key: str
+    ) -> Optional[str]:
+        """
+        Find a cached answer for a question similar to the query.
+
+        Args:
+            page_collection: Collection of the page being queried
+            query_embedding: Embedding of the question
+            request_key: Key of the request (see request_key())
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        try:
+            results = self.vector_db.similarity_search(
+                self.collection_name(page_collection),
+                query_embedding,
+                k=1,
+                filter_metadata={"key": request_key},
+            )
+        except VectorDBError as e:
+            logger.debug(f"Response cache miss for '{page_collection}': {e}")
+            return None
+
+        if not results:
+            return None
+
+        cached, score = results[0]
+        if score < self.min_similarity:
+            return None
+        if time.time() - float(cached.metadata.get("ts", 0)) > self.ttl_seconds:
+            return None
+
+        logger.info(f"Response cache hit (similarity={score:.3f}): {cached.content}")
+        return cached.metadata["response"]
+
+    def store(
+        self,
+        page_collection: str,
+        question: str,
+        query_embedding: Embedding,
+        response: str,
+        request_key: str,
+    ) -> None:
+        """
+        Cache an answer under its question's embedding.
+
+        Args:
+            page_collection: Collection of the page that was queried
+            question: The question that was answered
+            query_embedding: Embedding of the question
+            response: LLM answer, without citations
+            request_key: Key of the request (see request_key())
+        """
+        entry = DocumentChunk.model_construct(
+            chunk_id=uuid.uuid4().hex,
+            content=question,
+            metadata={
+                "response": response,
+                "ts": f"{time.time():.3f}",
+                "key": request_key,
+            },
+            source_page_title=page_collection,
+            source_url="",
+            section_title=None,
+            chunk_index=0,
+        )
+
+        try:
+            self.vector_db.store_documents(
+                self.collection_name(page_collection), [entry], [query_embedding]
+            )
+        except VectorDBError as e:
+            logger.warning(f"Failed to cache response: {e}")
+
+    def invalidate(self, page_collection: str) -> None:
+        """
+        Drop every cached answer for a page.
+
+        Args:
+            page_collection: Collection of the page whose answers to drop
+        """
+        name = self.collection_name(page_collection)
+        try:
+            if self.vector_db.collection_exists(name):
+                self.vector_db.delete_collection(name)
+                logger.info(f"Invalidated response cache: {name}")
+        except VectorDBError as e:
+            logger.warning(f"Failed to invalidate response cache: {e}")
@@ -5,13 +5,18 @@ Supports both Wikipedia API and HTML parsing as fallback.
 """
 
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
-from urllib.parse import unquote, urlparse
+from urllib.parse import unquote
 
 import requests
 import wikipediaapi
-from bs4 import BeautifulSoup
 
 from src.models.schemas import WikipediaPage, WikipediaSection
 from src.utils.config import get_settings
@@ -19,6 +24,50 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Reference markers ([1], [2], ...) or bare URLs, scanned in a single pass
+_REFERENCE_RE = re.compile(r"\[(\d+)\]|(https?://\S+)")
+
+MAX_REFERENCES = 50
+
+# Page title in a Wikipedia article URL, up to any query string or fragment
+_WIKI_URL_RE = re.compile(r"https?://[^/]+/wiki/([^?#]+)")
+
+
+@lru_cache(maxsize=8)
+def _get_wiki_api(language: str, user_agent: str) -> wikipediaapi.Wikipedia:
+    """
+    Get the Wikipedia API client for a language and user agent.
+
+    Clients are cached so short-lived scrapers (e.g. fetch_wikipedia_page)
+    reuse one client and its pooled HTTP connections.
+    """
+    return wikipediaapi.Wikipedia(
+        user_agent=user_agent,
+        language=language,
+        extract_format=wikipediaapi.ExtractFormat.WIKI,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _title_from_identifier(identifier: str) -> str:
+    """
+    Title extraction behind WikipediaScraper._extract_title_from_identifier.
+
+    Memoized on the identifier, so repeated fetches of the same URL skip the
+    regex match and unquoting.
+    """
+    # If it's a URL, extract the title
+    # Example: https://en.wikipedia.org/wiki/Quantum_mechanics -> Quantum mechanics
+    if identifier.startswith(("http://", "https://")):
+        match = _WIKI_URL_RE.match(identifier)
+        if match:
+            return unquote(match.group(1)).replace("_", " ")
+
+        raise ValueError(f"Could not extract page title from URL: {identifier}")
+
+    # Otherwise, assume it's already a title
+    return identifier
+
 
 class WikipediaScraperError(Exception):
     """Base exception for Wikipedia scraper errors."""
@@ -43,8 +92,24 @@ class WikipediaScraper:
     Scraper for retrieving Wikipedia pages using the Wikipedia API.
 
     Handles page retrieval, parsing, and error cases gracefully.
+
+    Fetched pages and page info are kept in LRU caches shared by all
+    scrapers and keyed on (language, title), so re-requesting a page skips
+    the API round-trip. Entries expire after CACHE_TTL_SECONDS; call
+    ``clear_cache()`` to force fresh fetches sooner.
     """
 
+    PAGE_CACHE_SIZE = 256
+    PAGE_INFO_CACHE_SIZE = 64
+
+    # Cached entries older than this are refetched, so edited pages show up
+    CACHE_TTL_SECONDS = 3600.0
+
+    # (language, title) -> (time cached, entry), least recently used first
+    _page_cache: OrderedDict[tuple[str, str], tuple[float, WikipediaPage]] = OrderedDict()
+    _page_info_cache: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def __init__(self, language: Optional[str] = None, user_agent: Optional[str] = None):
         """
         Initialize the Wikipedia scraper.
@@ -57,15 +122,33 @@ class WikipediaScraper:
         self.language = language or settings.wikipedia_language
         self.user_agent = user_agent or settings.user_agent
 
-        # Initialize Wikipedia API
-        self.wiki_api = wikipediaapi.Wikipedia(
-            user_agent=self.user_agent,
-            language=self.language,
-            extract_format=wikipediaapi.ExtractFormat.WIKI,
-        )
+        # Wikipedia API client, shared by every scraper with the same settings
+        self.wiki_api = _get_wiki_api(self.language, self.user_agent)
+
+        # Keep-alive session for direct API calls (search), so repeated
+        # requests reuse one pooled TLS connection
+        self._http = requests.Session()
+        self._http.headers.update({"User-Agent": self.user_agent})
 
         logger.info(f"Initialized Wikipedia scraper for language: {self.language}")
 
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self._http.close()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached pages and page info."""
+        with cls._cache_lock:
+            cls._page_cache.clear()
+            cls._page_info_cache.clear()
+
+    def __enter__(self) -> "WikipediaScraper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def fetch(self, page_identifier: str) -> WikipediaPage:
         """
         Fetch a Wikipedia page by title or URL.
@@ -83,6 +166,12 @@ class WikipediaScraper:
         # Extract page title from URL if needed
         page_title = self._extract_title_from_identifier(page_identifier)
 
+        cache_key = self._cache_key(page_title)
+        cached = self._get_cached(self._page_cache, cache_key)
+        if cached is not None:
+            logger.info(f"Using cached Wikipedia page: {page_title}")
+            return cached.model_copy(deep=True)
+
         logger.info(f"Fetching Wikipedia page: {page_title}")
 
         try:
@@ -102,7 +191,8 @@ class WikipediaScraper:
                 f"{len(wikipedia_page.sections)} sections)"
             )
 
-            return wikipedia_page
+            self._set_cached(self._page_cache, cache_key, wikipedia_page, self.PAGE_CACHE_SIZE)
+            return wikipedia_page.model_copy(deep=True)
 
         except PageNotFoundError:
             raise
@@ -110,6 +200,31 @@ class WikipediaScraper:
             logger.error(f"Error fetching page {page_title}: {e}", exc_info=True)
             raise NetworkError(f"Failed to fetch Wikipedia page: {e}") from e
 
+    def fetch_many(self, page_identifiers: list[str], max_workers: int = 8) -> list[WikipediaPage]:
+        """
+        Fetch several Wikipedia pages concurrently.
+
+        Page requests are I/O bound, so a thread pool overlaps their network
+        round-trips over the shared API client.
+
+        Args:
+            page_identifiers: Wikipedia page titles or URLs
+            max_workers: Maximum number of pages fetched at once
+
+        Returns:
+            WikipediaPage objects in the same order as the identifiers
+
+        Raises:
+            PageNotFoundError: If any page doesn't exist
+            NetworkError: If any request fails
+        """
+        if not page_identifiers:
+            return []
+
+        workers = max(1, min(max_workers, len(page_identifiers)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wiki-fetch") as executor:
+            return list(executor.map(self.fetch, page_identifiers))
+
     def _extract_title_from_identifier(self, identifier: str) -> str:
         """
         Extract page title from URL or return identifier as-is.
@@ -120,27 +235,7 @@ class WikipediaScraper:
         Returns:
             Page title
         """
-        # If it's a URL, extract the title
-        if identifier.startswith("http://") or identifier.startswith("https://"):
-            parsed_url = urlparse(identifier)
-
-            # Extract title from URL path
-            # Example: https://en.wikipedia.org/wiki/Quantum_mechanics -> Quantum_mechanics
-            path_parts = parsed_url.path.split("/")
-            if "wiki" in path_parts:
-                wiki_index = path_parts.index("wiki")
-                if wiki_index + 1 < len(path_parts):
-                    title = path_parts[wiki_index + 1]
-                    # Decode URL encoding
-                    title = unquote(title)
-                    # Replace underscores with spaces
-                    title = title.replace("_", " ")
-                    return title
-
-            raise ValueError(f"Could not extract page title from URL: {identifier}")
-
-        # Otherwise, assume it's already a title
-        return identifier
+        return _title_from_identifier(identifier)
 
     def _parse_page(self, page: wikipediaapi.WikipediaPage) -> WikipediaPage:
         """
@@ -161,13 +256,14 @@ class WikipediaScraper:
         # Extract references (basic extraction from text)
         references = self._extract_references(page.text)
 
-        # Extract categories
-        categories = list(page.categories.keys()) if hasattr(page, "categories") else []
+        # Extract categories (iterating the categories dict yields their titles)
+        page_categories = getattr(page, "categories", None)
+        categories = list(page_categories) if page_categories else []
 
         return WikipediaPage(
             title=page.title,
             url=page.fullurl,
-            page_id=page.pageid if hasattr(page, "pageid") else None,
+            page_id=getattr(page, "pageid", None),
             language=self.language,
             summary=page.summary,
             sections=sections,
@@ -194,18 +290,21 @@ class WikipediaScraper:
 
         for section in sections:
             # Skip empty sections
-            if not section.text or not section.text.strip():
+            text = section.text
+            content = text.strip() if text else ""
+            if not content:
                 continue
 
-            # Parse subsections recursively
+            # Parse subsections recursively (MediaWiki headings nest at most 6 deep)
+            child_sections = section.sections
             subsections = (
-                self._parse_sections(section.sections, level + 1) if section.sections else []
+                self._parse_sections(child_sections, level + 1) if child_sections else []
             )
 
             parsed_section = WikipediaSection(
                 title=section.title,
                 level=level,
-                content=section.text.strip(),
+                content=content,
                 subsections=subsections,
             )
 
@@ -224,17 +323,27 @@ class WikipediaScraper:
         Returns:
             Complete page content as string
         """
-        content_parts = [main_text]
+        return "\n".join([main_text, *self._iter_section_content(sections)])
+
+    @staticmethod
+    def _iter_section_content(sections: list[WikipediaSection]) -> Iterator[str]:
+        """
+        Yield each section's heading and content in document order.
 
-        def add_section_content(section: WikipediaSection):
-            content_parts.append(f"\n\n{'#' * section.level} {section.title}\n\n{section.content}")
-            for subsection in section.subsections:
-                add_section_content(subsection)
+        Walks the section tree depth-first with an explicit stack, so deeply
+        nested pages cannot hit the recursion limit.
 
-        for section in sections:
-            add_section_content(section)
+        Args:
+            sections: Top-level sections
 
-        return "\n".join(content_parts)
+        Yields:
+            Markdown-style heading followed by the section content
+        """
+        stack = list(reversed(sections))
+        while stack:
+            section = stack.pop()
+            yield f"\n\n{'#' * section.level} {section.title}\n\n{section.content}"
+            stack.extend(reversed(section.subsections))
 
     def _extract_references(self, text: str) -> list[str]:
         """
@@ -248,20 +357,14 @@ class WikipediaScraper:
         """
         # This is a simplified approach
         # In a full implementation, you'd parse the actual references section
-        references = []
+        references: dict[str, None] = {}
 
-        # Look for common reference patterns
-        ref_patterns = [
-            r"\[(\d+)\]",  # [1], [2], etc.
-            r"(https?://[^\s]+)",  # URLs
-        ]
+        for match in _REFERENCE_RE.finditer(text):
+            references[match.group(match.lastindex)] = None
+            if len(references) >= MAX_REFERENCES:
+                break
 
-        for pattern in ref_patterns:
-            matches = re.findall(pattern, text)
-            references.extend(matches)
-
-        # Remove duplicates and limit
-        return list(set(references))[:50]
+        return list(references)
 
     def search_pages(self, query: str, limit: int = 10) -> list[str]:
         """
@@ -286,12 +389,12 @@ class WikipediaScraper:
                 "format": "json",
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._http.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
-            # OpenSearch returns [query, [titles], [descriptions], [urls]]
-            titles = data[1] if len(data) > 1 else []
+            # OpenSearch returns [query, [titles], [descriptions], [urls]]; a
+            # malformed payload raises here and is handled below
+            titles = response.json()[1]
 
             logger.info(f"Found {len(titles)} results for query: {query}")
             return titles
@@ -310,23 +413,59 @@ class WikipediaScraper:
         Returns:
             Dictionary with page info or None if not found
         """
+        cache_key = self._cache_key(page_title)
+        cached = self._get_cached(self._page_info_cache, cache_key)
+        if cached is not None:
+            return dict(cached)
+
         try:
             page = self.wiki_api.page(page_title)
 
             if not page.exists():
                 return None
 
-            return {
+            info = {
                 "title": page.title,
                 "url": page.fullurl,
                 "summary": page.summary[:200] + "..." if len(page.summary) > 200 else page.summary,
                 "exists": True,
             }
+            self._set_cached(self._page_info_cache, cache_key, info, self.PAGE_INFO_CACHE_SIZE)
+            return dict(info)
 
         except Exception as e:
             logger.error(f"Error getting page info: {e}", exc_info=True)
             return None
 
+    def _cache_key(self, page_title: str) -> tuple[str, str]:
+        """Cache key for a page: language plus the title with underscores as spaces."""
+        return self.language, page_title.strip().replace("_", " ")
+
+    @classmethod
+    def _get_cached(cls, cache: OrderedDict, key: tuple[str, str]):
+        """Return a cached entry and mark it recently used, or None if missing or expired."""
+        with cls._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+
+            cached_at, value = entry
+            if time.monotonic() - cached_at > cls.CACHE_TTL_SECONDS:
+                del cache[key]
+                return None
+
+            cache.move_to_end(key)
+            return value
+
+    @classmethod
+    def _set_cached(cls, cache: OrderedDict, key: tuple[str, str], value, max_size: int) -> None:
+        """Cache an entry, evicting the least recently used beyond max_size."""
+        with cls._cache_lock:
+            cache[key] = (time.monotonic(), value)
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
 
 # Convenience function
 def fetch_wikipedia_page(page_identifier: str, language: str = "en") -> WikipediaPage:
@@ -344,5 +483,5 @@ def fetch_wikipedia_page(page_identifier: str, language: str = "en") -> Wikipedi
         PageNotFoundError: If page doesn't exist
         NetworkError: If request fails
     """
-    scraper = WikipediaScraper(language=language)
-    return scraper.fetch(page_identifier)
+    with WikipediaScraper(language=language) as scraper:
+        return scraper.fetch(page_identifier)
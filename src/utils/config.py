@@ -5,6 +5,7 @@ Loads and validates configuration from environment variables and .env files.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -25,6 +26,9 @@ class Settings(BaseSettings):
     llm_provider: str = "lmstudio"
     lmstudio_base_url: str = "http://localhost:1234/v1"
     lmstudio_model: str = "mistral-7b-instruct"
+    lmstudio_supports_system_role: bool = False
+    lmstudio_http_max_connections: int = 64
+    lmstudio_http_max_keepalive_connections: int = 32
     llm_temperature: float = 0.7
     llm_max_tokens: int = 1000
 
@@ -42,6 +46,18 @@ class Settings(BaseSettings):
     chroma_host: str = "localhost"
     chroma_port: int = 8000
     chroma_persist_dir: str = "./chroma_data"
+    chroma_batch_size: int = 1000
+    chroma_hnsw_m: int = 16
+    chroma_hnsw_construction_ef: int = 64
+    chroma_hnsw_search_ef: int = 64
+    chroma_http_max_connections: int = 32
+    chroma_http_max_keepalive_connections: int = 16
+
+    # FAISS Configuration (in-process alternative to Chroma; needs faiss-cpu)
+    faiss_persist_dir: str = "./faiss_data"
+    faiss_hnsw_m: int = 32
+    faiss_hnsw_construction_ef: int = 64
+    faiss_hnsw_search_ef: int = 64
 
     # Weaviate Configuration
     weaviate_url: str = "http://localhost:8080"
@@ -54,8 +70,16 @@ class Settings(BaseSettings):
     # RAG Configuration
     chunk_size: int = 800
     chunk_overlap: int = 150
+    chunk_by_tokens: bool = False
     top_k_results: int = 5
-    min_similarity_score: float = 0.7
+    # Similarity scores are (1 + cosine) / 2 in [0, 1]; 0.89 ~ cosine 0.79
+    min_similarity_score: float = 0.89
+
+    # Semantic response cache, opt-in: near-identical but distinct questions
+    # can clear the bar (same [0-1] scale; 0.965 ~ cosine 0.93)
+    llm_cache_enabled: bool = False
+    llm_cache_min_similarity: float = 0.965
+    llm_cache_ttl_seconds: float = 1800.0
 
     # Wikipedia Configuration
     wikipedia_language: str = "en"
@@ -104,9 +128,7 @@ class Settings(BaseSettings):
 
 
 # Global settings instance
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings singleton.
@@ -114,11 +136,9 @@ def get_settings() -> Settings:
     Returns:
         Settings instance with validated configuration
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-        _settings.validate_settings()
-    return _settings
+    settings = Settings()
+    settings.validate_settings()
+    return settings
 
 
 def reload_settings() -> Settings:
@@ -128,10 +148,8 @@ def reload_settings() -> Settings:
     Returns:
         Fresh Settings instance
     """
-    global _settings
-    _settings = Settings()
-    _settings.validate_settings()
-    return _settings
+    get_settings.cache_clear()
+    return get_settings()
 
 
 # Convenience function for getting specific settings
@@ -156,6 +174,12 @@ def get_vector_db_config() -> dict:
             "host": settings.chroma_host,
             "port": settings.chroma_port,
             "persist_dir": settings.chroma_persist_dir,
+            "batch_size": settings.chroma_batch_size,
+        }
+    elif settings.vector_db == "faiss":
+        return {
+            "type": "faiss",
+            "persist_dir": settings.faiss_persist_dir,
         }
     elif settings.vector_db == "weaviate":
         return {
@@ -182,4 +206,5 @@ def get_chunking_config() -> dict:
     return {
         "chunk_size": settings.chunk_size,
         "chunk_overlap": settings.chunk_overlap,
+        "chunk_by_tokens": settings.chunk_by_tokens,
     }
@@ -4,8 +4,12 @@ Logging configuration for the RAG Wikipedia Chatbot.
 Provides structured logging with both file and console output.
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +19,66 @@ from rich.logging import RichHandler
 # Global logger instances
 _loggers: dict[str, logging.Logger] = {}
 
+# Handlers shared by every logger, keyed by destination
+_handlers: dict[str, logging.Handler] = {}
+_handlers_lock = threading.Lock()
+
+_FILE_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+def _get_handler(key: str) -> logging.Handler:
+    """
+    Get the shared handler for a destination, creating it on first use.
+
+    Log files are written by a background QueueListener, so logging calls
+    only enqueue the record instead of blocking on disk I/O. The listener
+    is stopped (flushing pending records) at interpreter exit.
+
+    Args:
+        key: "rich" or "stdout" for console output, or a log file path
+
+    Returns:
+        Handler shared by all loggers writing to that destination
+    """
+    with _handlers_lock:
+        handler = _handlers.get(key)
+        if handler is not None:
+            return handler
+
+        if key == "rich":
+            handler = RichHandler(
+                rich_tracebacks=True,
+                markup=True,
+                show_time=False,
+                show_path=False,
+            )
+            handler.setLevel(logging.INFO)
+        elif key == "stdout":
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setLevel(logging.INFO)
+            handler.setFormatter(_FILE_FORMATTER)
+        else:
+            log_path = Path(key)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+
+            file_handler = logging.FileHandler(key, encoding="utf-8")
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(_FILE_FORMATTER)
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+
+            handler = QueueHandler(log_queue)
+            handler.setLevel(logging.DEBUG)
+
+        _handlers[key] = handler
+        return handler
+
 
 def setup_logger(
     name: str,
@@ -45,37 +109,12 @@ def setup_logger(
     if logger.handlers:
         return logger
 
-    # Create formatters
-    file_formatter = logging.Formatter(
-        fmt="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Console handler with Rich
-    if use_rich:
-        console_handler = RichHandler(
-            rich_tracebacks=True,
-            markup=True,
-            show_time=False,
-            show_path=False,
-        )
-        console_handler.setLevel(logging.INFO)
-    else:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(file_formatter)
-
-    logger.addHandler(console_handler)
+    # Console handler, with Rich or plain stdout
+    logger.addHandler(_get_handler("rich" if use_rich else "stdout"))
 
     # File handler (if specified)
     if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(_get_handler(log_file))
 
     _loggers[name] = logger
     return logger
@@ -2,6 +2,7 @@
 Tests for ChromaDB adapter functionality.
 """
 
+import numpy as np
 import pytest
 
 from src.adapters.chroma_adapter import ChromaAdapter
@@ -43,15 +44,13 @@ class TestChromaAdapter:
     @pytest.fixture
     def sample_embeddings(self):
         """Create sample embeddings (random vectors for testing)."""
-        import random
-
-        return [[random.random() for _ in range(384)] for _ in range(2)]
+        return np.random.default_rng(0).random((2, 384), dtype=np.float32)
 
     def test_adapter_initialization(self, adapter):
         """Test adapter initializes correctly."""
         assert adapter.host == "localhost"
         assert adapter.port == 8000
-        assert adapter.client is None  # Not connected yet
+        assert adapter.client is not None  # Connected on construction
 
     # @pytest.mark.skip(reason="Requires Docker/Chroma running")
     def test_initialize_connection(self, adapter):
@@ -142,6 +141,30 @@ class TestChromaAdapter:
         # Cleanup
         adapter.delete_collection(collection_name)
 
+    # @pytest.mark.skip(reason="Requires Docker/Chroma running")
+    def test_similarity_search_columns(self, adapter, sample_chunks, sample_embeddings):
+        """Test column-oriented similarity search matches tuple results."""
+        adapter.initialize()
+        collection_name = "test_search_columns_collection"
+
+        # Clean up
+        if adapter.collection_exists(collection_name):
+            adapter.delete_collection(collection_name)
+
+        adapter.store_documents(collection_name, sample_chunks, sample_embeddings)
+
+        rows = adapter.similarity_search(collection_name, sample_embeddings[0], k=2)
+        columns = adapter.similarity_search_columns(collection_name, sample_embeddings[0], k=2)
+
+        assert len(columns) == len(rows)
+        assert columns.ids == [chunk.chunk_id for chunk, _ in rows]
+        assert columns.section_titles == [chunk.section_title for chunk, _ in rows]
+        for score, (_, row_score) in zip(columns.scores, rows):
+            assert score == pytest.approx(row_score, rel=1e-5)
+
+        # Cleanup
+        adapter.delete_collection(collection_name)
+
     # @pytest.mark.skip(reason="Requires Docker/Chroma running")
     def test_search_nonexistent_collection(self, adapter, sample_embeddings):
         """Test searching in non-existent collection raises error."""
@@ -152,6 +175,27 @@ class TestChromaAdapter:
                 "nonexistent_collection", sample_embeddings[0], k=5
             )
 
+    # @pytest.mark.skip(reason="Requires Docker/Chroma running")
+    def test_similarity_search_many(self, adapter, sample_chunks, sample_embeddings):
+        """Test batched search returns one result list per query."""
+        adapter.initialize()
+        collection_name = "test_search_many_collection"
+
+        # Clean up
+        if adapter.collection_exists(collection_name):
+            adapter.delete_collection(collection_name)
+
+        adapter.store_documents(collection_name, sample_chunks, sample_embeddings)
+
+        results = adapter.similarity_search_many(collection_name, sample_embeddings, k=1)
+
+        assert len(results) == 2
+        assert results[0][0][0].chunk_id == "test_001"
+        assert results[1][0][0].chunk_id == "test_002"
+
+        # Cleanup
+        adapter.delete_collection(collection_name)
+
     # @pytest.mark.skip(reason="Requires Docker/Chroma running")
     def test_get_collection_info(self, adapter, sample_chunks, sample_embeddings):
         """Test getting collection info."""
@@ -232,9 +276,7 @@ class TestChromaAdapter:
         ]
 
         # Create random embeddings
-        import random
-
-        embeddings = [[random.random() for _ in range(384)] for _ in range(150)]
+        embeddings = np.random.default_rng(0).random((150, 384), dtype=np.float32)
 
         # Store
         adapter.store_documents(collection_name, chunks, embeddings)
@@ -245,3 +287,27 @@ class TestChromaAdapter:
 
         # Cleanup
         adapter.delete_collection(collection_name)
+
+    # @pytest.mark.skip(reason="Requires Docker/Chroma running")
+    def test_batch_storage_callback(self, adapter, sample_chunks, sample_embeddings):
+        """Test batch callback reports every stored chunk."""
+        adapter.initialize()
+        collection_name = "test_batch_callback_collection"
+
+        # Clean up
+        if adapter.collection_exists(collection_name):
+            adapter.delete_collection(collection_name)
+
+        batches = []
+        adapter.store_documents(
+            collection_name,
+            sample_chunks,
+            sample_embeddings,
+            batch_size=1,
+            on_batch_processed=batches.append,
+        )
+
+        assert batches == [1, 1]
+
+        # Cleanup
+        adapter.delete_collection(collection_name)
@@ -75,6 +75,14 @@ class TestDocumentProcessor:
         assert "[2]" not in clean_text
         assert "This is a sentence with references." == clean_text
 
+    def test_clean_text_bulk_matches_clean_text(self, sample_page):
+        """Test bulk cleaning gives the same result as cleaning each text."""
+        processor = DocumentProcessor()
+
+        texts = ["See [[Python|it]]  here.", "", "{{unclosed", "}} text[1] ..", "."]
+
+        assert processor._clean_text_bulk(texts) == [processor._clean_text(t) for t in texts]
+
     def test_process_page_creates_chunks(self, sample_page):
         """Test that processing creates chunks."""
         processor = DocumentProcessor()
@@ -128,6 +136,24 @@ class TestDocumentProcessor:
         for chunk in chunks:
             assert len(chunk.content) <= 200 * 4 * 1.2  # Allow 20% tolerance
 
+    def test_token_counts_with_tokenizer(self, sample_page):
+        """Test chunks get exact token counts when a tokenizer is given."""
+        from tokenizers import Tokenizer, models, pre_tokenizers
+        from transformers import PreTrainedTokenizerFast
+
+        # Offline word-level tokenizer: one token per word or punctuation mark
+        backend = Tokenizer(models.WordLevel({"[UNK]": 0}, unk_token="[UNK]"))
+        backend.pre_tokenizer = pre_tokenizers.Whitespace()
+        tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]")
+
+        processor = DocumentProcessor(tokenizer=tokenizer)
+        chunks = processor.process_page(sample_page)
+
+        assert len(chunks) > 0
+        for chunk in chunks:
+            assert chunk.token_count == len(tokenizer.tokenize(chunk.content))
+            assert chunk.token_count <= processor.config.chunk_size
+
     def test_chunk_id_generation(self, sample_page):
         """Test that chunk IDs are unique."""
         processor = DocumentProcessor()
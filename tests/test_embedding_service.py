@@ -2,6 +2,9 @@
 Tests for embedding service functionality.
 """
 
+import asyncio
+
+import numpy as np
 import pytest
 
 from src.models.schemas import DocumentChunk, EmbeddingConfig
@@ -33,6 +36,15 @@ class TestEmbeddingService:
         assert service.embedding_dimension is not None
         assert service.embedding_dimension > 0
 
+    def test_load_model_in_background(self):
+        """Test background model loading."""
+        service = EmbeddingService()
+        loader = service.load_model_in_background()
+        loader.join()
+
+        assert service.model is not None
+        assert service.embedding_dimension is not None
+
     def test_embed_single_text(self):
         """Test embedding a single text."""
         service = EmbeddingService()
@@ -40,9 +52,23 @@ class TestEmbeddingService:
 
         embedding = service.embed_text(text)
 
-        assert isinstance(embedding, list)
-        assert len(embedding) > 0
-        assert all(isinstance(x, float) for x in embedding)
+        assert isinstance(embedding, np.ndarray)
+        assert embedding.dtype == np.float32
+        assert embedding.shape == (service.embedding_dimension,)
+
+    def test_aembed_text_batches_concurrent_calls(self):
+        """Test concurrent async embeddings match their one-by-one results."""
+        service = EmbeddingService()
+        texts = [f"Concurrent sentence {n}." for n in range(5)]
+
+        async def embed_all():
+            return await asyncio.gather(*(service.aembed_text(text) for text in texts))
+
+        embeddings = asyncio.run(embed_all())
+
+        for text, embedding in zip(texts, embeddings):
+            assert embedding.shape == (service.embedding_dimension,)
+            assert np.allclose(embedding, service.embed_text(text), atol=1e-5)
 
     def test_embed_multiple_texts(self):
         """Test embedding multiple texts."""
@@ -55,9 +81,33 @@ class TestEmbeddingService:
 
         embeddings = service.embed_texts(texts, show_progress=False)
 
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.dtype == np.float32
+        assert embeddings.shape == (3, service.embedding_dimension)
+
+    def test_embed_duplicate_texts(self):
+        """Test duplicate texts get identical embeddings in their original positions."""
+        service = EmbeddingService()
+        texts = ["Same sentence.", "Other sentence.", "Same sentence."]
+
+        embeddings = service.embed_texts(texts, show_progress=False)
+
         assert len(embeddings) == 3
-        assert all(isinstance(emb, list) for emb in embeddings)
-        assert all(len(emb) == len(embeddings[0]) for emb in embeddings)
+        assert np.array_equal(embeddings[0], embeddings[2])
+        assert not np.array_equal(embeddings[0], embeddings[1])
+
+    def test_embeddings_cached_across_calls(self):
+        """Test texts embedded once are served from the embedding cache."""
+        service = EmbeddingService()
+
+        first = service.embed_texts(["Cached sentence."], show_progress=False)
+        assert len(service._embedding_cache) == 1
+
+        second = service.embed_texts(["Cached sentence.", "New sentence."], show_progress=False)
+
+        assert len(service._embedding_cache) == 2
+        assert np.array_equal(first[0], second[0])
+        assert np.array_equal(service.embed_text("Cached sentence."), first[0])
 
     def test_embed_empty_list(self):
         """Test embedding empty list returns empty."""
@@ -65,7 +115,7 @@ class TestEmbeddingService:
 
         embeddings = service.embed_texts([], show_progress=False)
 
-        assert embeddings == []
+        assert len(embeddings) == 0
 
     def test_embed_chunks(self):
         """Test embedding document chunks."""
@@ -92,8 +142,9 @@ class TestEmbeddingService:
 
         embeddings = service.embed_chunks(chunks, show_progress=False)
 
-        assert len(embeddings) == 2
-        assert all(isinstance(emb, list) for emb in embeddings)
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.dtype == np.float32
+        assert embeddings.shape == (2, service.get_embedding_dimension())
 
     def test_embedding_dimension(self):
         """Test getting embedding dimension."""
@@ -114,34 +165,26 @@ class TestEmbeddingService:
         embedding = service.embed_text("Test sentence")
 
         # Check if roughly unit length (normalized)
-        import math
-
-        magnitude = math.sqrt(sum(x**2 for x in embedding))
+        magnitude = np.linalg.norm(embedding)
         assert 0.99 <= magnitude <= 1.01  # Allow small floating point error
 
     def test_similar_texts_have_similar_embeddings(self):
         """Test that similar texts produce similar embeddings."""
         service = EmbeddingService()
 
-        text1 = "The cat sits on the mat"
-        text2 = "A cat is sitting on a mat"
-        text3 = "Python is a programming language"
-
-        emb1 = service.embed_text(text1)
-        emb2 = service.embed_text(text2)
-        emb3 = service.embed_text(text3)
-
-        # Compute cosine similarity
-        def cosine_similarity(a: list[float], b: list[float]) -> float:
-            import math
+        texts = [
+            "The cat sits on the mat",
+            "A cat is sitting on a mat",
+            "Python is a programming language",
+        ]
 
-            dot_product = sum(x * y for x, y in zip(a, b))
-            mag_a = math.sqrt(sum(x**2 for x in a))
-            mag_b = math.sqrt(sum(y**2 for y in b))
-            return dot_product / (mag_a * mag_b)
+        embeddings = service.embed_texts(texts, show_progress=False)
 
-        sim_1_2 = cosine_similarity(emb1, emb2)
-        sim_1_3 = cosine_similarity(emb1, emb3)
+        # Cosine similarity of every pair in one matrix product
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        similarities = unit @ unit.T
+        sim_1_2 = similarities[0, 1]
+        sim_1_3 = similarities[0, 2]
 
         # Similar texts should have higher similarity
         assert sim_1_2 > sim_1_3
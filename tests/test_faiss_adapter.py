@@ -0,0 +1,99 @@
+"""
+Tests for FAISS adapter functionality.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from src.adapters.faiss_adapter import FaissAdapter
+from src.adapters.vectordb_adapter import CollectionNotFoundError
+from src.models.schemas import DocumentChunk
+
+
+class TestFaissAdapter:
+    """Test cases for FaissAdapter."""
+
+    @pytest.fixture
+    def adapter(self, tmp_path):
+        """Create a FaissAdapter writing to a temporary directory."""
+        return FaissAdapter(persist_dir=str(tmp_path))
+
+    @pytest.fixture
+    def sample_chunks(self):
+        """Create sample document chunks."""
+        return [
+            DocumentChunk(
+                chunk_id=f"test_{i:03d}",
+                content=f"Test content {i}",
+                metadata={"page_title": "Test", "section": "Even" if i % 2 == 0 else "Odd"},
+                source_page_title="Test",
+                source_url="https://test.com",
+                chunk_index=i,
+            )
+            for i in range(10)
+        ]
+
+    @pytest.fixture
+    def sample_embeddings(self):
+        """Create random sample embeddings."""
+        return np.random.default_rng(0).standard_normal((10, 32)).astype(np.float32)
+
+    def test_store_and_search(self, adapter, sample_chunks, sample_embeddings):
+        """Test storing chunks and finding each one by its own vector."""
+        adapter.store_documents("test_collection", sample_chunks, sample_embeddings)
+
+        results = adapter.similarity_search("test_collection", sample_embeddings[3], k=3)
+
+        assert len(results) == 3
+        assert results[0][0].chunk_id == "test_003"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert all(0.0 <= score <= 1.0 for _, score in results)
+
+    def test_similarity_search_many(self, adapter, sample_chunks, sample_embeddings):
+        """Test batched search returns one result list per query."""
+        adapter.store_documents("test_collection", sample_chunks, sample_embeddings)
+
+        results = adapter.similarity_search_many("test_collection", sample_embeddings[:4], k=1)
+
+        assert [hits[0][0].chunk_id for hits in results] == [f"test_{i:03d}" for i in range(4)]
+
+    def test_filter_metadata(self, adapter, sample_chunks, sample_embeddings):
+        """Test metadata filters restrict results."""
+        adapter.store_documents("test_collection", sample_chunks, sample_embeddings)
+
+        results = adapter.similarity_search(
+            "test_collection", sample_embeddings[3], k=3, filter_metadata={"section": "Even"}
+        )
+
+        assert len(results) == 3
+        assert all(chunk.section_title == "Even" for chunk, _ in results)
+
+    def test_persistence(self, tmp_path, sample_chunks, sample_embeddings):
+        """Test collections are reloaded by a new adapter."""
+        adapter = FaissAdapter(persist_dir=str(tmp_path))
+        adapter.store_documents("test_collection", sample_chunks, sample_embeddings)
+
+        # Writes stay in memory until flushed
+        assert not FaissAdapter(persist_dir=str(tmp_path)).collection_exists("test_collection")
+        adapter.flush()
+
+        reopened = FaissAdapter(persist_dir=str(tmp_path))
+
+        assert reopened.collection_exists("test_collection")
+        assert reopened.get_collection_info("test_collection")["count"] == 10
+        results = reopened.similarity_search("test_collection", sample_embeddings[5], k=1)
+        assert results[0][0].chunk_id == "test_005"
+
+    def test_clear_and_delete(self, adapter, sample_chunks, sample_embeddings):
+        """Test clearing and deleting a collection."""
+        adapter.store_documents("test_collection", sample_chunks, sample_embeddings)
+
+        adapter.clear_collection("test_collection")
+        assert adapter.get_collection_info("test_collection")["count"] == 0
+
+        adapter.delete_collection("test_collection")
+        assert not adapter.collection_exists("test_collection")
+        with pytest.raises(CollectionNotFoundError):
+            adapter.similarity_search("test_collection", sample_embeddings[0])
@@ -2,6 +2,9 @@
 Tests for LMStudio adapter functionality.
 """
 
+import asyncio
+import time
+
 import pytest
 
 from src.adapters.lmstudio_adapter import LMStudioAdapter
@@ -24,6 +27,69 @@ class TestLMStudioAdapter:
         assert adapter.model == "local-model"
         assert adapter.client is not None
 
+    def test_exact_cache(self, adapter, monkeypatch):
+        """Test deterministic requests are cached with LRU eviction."""
+        monkeypatch.setattr(adapter, "EXACT_CACHE_SIZE", 2)
+        messages = [{"role": "user", "content": "What is 2+2?"}]
+
+        keys = [adapter._request_key(messages, 0.0, n, {}) for n in (10, 20, 30)]
+        assert len(set(keys)) == 3
+
+        adapter._set_exact_cached(keys[0], "4")
+        adapter._set_exact_cached(keys[1], "four")
+        assert adapter._get_exact_cached(keys[0]) == "4"
+
+        # keys[1] is now least recently used and is evicted first
+        adapter._set_exact_cached(keys[2], "IV")
+        assert adapter._get_exact_cached(keys[1]) is None
+        assert adapter._get_exact_cached(keys[0]) == "4"
+        assert adapter._get_exact_cached(keys[2]) == "IV"
+
+    def test_availability_backoff(self, adapter, monkeypatch):
+        """Test repeated failed status checks are cached for longer."""
+        monkeypatch.setattr(adapter, "UNAVAILABLE_THRESHOLD", 2)
+
+        def ttl():
+            return adapter._status_cache["available"][0] - time.monotonic()
+
+        assert adapter._record_availability(False) is False
+        assert ttl() <= adapter.AVAILABILITY_TTL
+
+        adapter._record_availability(False)
+        assert ttl() > adapter.AVAILABILITY_TTL
+
+        # A successful check resets the failure count
+        assert adapter._record_availability(True) is True
+        adapter._record_availability(False)
+        assert ttl() <= adapter.AVAILABILITY_TTL
+
+    def test_achat_owner_cancelled(self, adapter, monkeypatch):
+        """Test cancelling the first caller doesn't cancel identical waiting calls."""
+        calls = []
+
+        async def fake_request(payload):
+            calls.append(payload)
+            await asyncio.sleep(0.05)
+            return "4"
+
+        monkeypatch.setattr(adapter, "_achat_request", fake_request)
+        messages = [{"role": "user", "content": "What is 2+2?"}]
+
+        async def run():
+            owner = asyncio.create_task(adapter.achat(messages, temperature=0.0))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(adapter.achat(messages, temperature=0.0))
+            await asyncio.sleep(0)
+            owner.cancel()
+            return await waiter, owner
+
+        result, owner = asyncio.run(run())
+
+        assert result == "4"
+        assert owner.cancelled()
+        assert len(calls) == 1
+        assert adapter._inflight == {}
+
     @pytest.mark.skip(reason="Requires LMStudio running")
     def test_is_available(self, adapter):
         """Test checking if LMStudio is available."""
@@ -84,6 +150,42 @@ class TestLMStudioAdapter:
         assert isinstance(response, str)
         assert "alice" in response.lower()
 
+    @pytest.mark.skip(reason="Requires LMStudio running")
+    def test_achat_concurrent(self, adapter):
+        """Test several async chat completions in flight at once."""
+
+        async def ask_all():
+            return await asyncio.gather(
+                *(
+                    adapter.achat(
+                        [{"role": "user", "content": f"What is {n}+{n}?"}],
+                        temperature=0.1,
+                        max_tokens=50,
+                    )
+                    for n in range(3)
+                )
+            )
+
+        responses = asyncio.run(ask_all())
+
+        assert len(responses) == 3
+        assert all(isinstance(response, str) and response for response in responses)
+
+    @pytest.mark.skip(reason="Requires LMStudio running")
+    def test_stream_chat(self, adapter):
+        """Test streaming yields text deltas that form the full answer."""
+        deltas = list(
+            adapter.stream_chat(
+                [{"role": "user", "content": "Count from 1 to 5."}],
+                temperature=0.1,
+                max_tokens=50,
+            )
+        )
+
+        assert deltas
+        assert all(isinstance(delta, str) for delta in deltas)
+        assert "".join(deltas)
+
     @pytest.mark.skip(reason="Requires LMStudio running")
     def test_get_model_info(self, adapter):
         """Test getting model information."""
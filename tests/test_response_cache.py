@@ -0,0 +1,68 @@
+"""
+Tests for the semantic response cache.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from src.adapters.faiss_adapter import FaissAdapter
+from src.services.response_cache import SemanticResponseCache
+
+
+KEY = SemanticResponseCache.request_key("local-model", 0.7, 1000, 5, 0.89)
+
+
+class TestSemanticResponseCache:
+    """Test cases for SemanticResponseCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache backed by a FAISS adapter in a temporary directory."""
+        return SemanticResponseCache(
+            FaissAdapter(persist_dir=str(tmp_path)), min_similarity=0.965, ttl_seconds=60
+        )
+
+    @pytest.fixture
+    def question_embedding(self):
+        """Create a random unit-length question embedding."""
+        vector = np.random.default_rng(0).standard_normal(32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def test_miss_before_store(self, cache, question_embedding):
+        """Test lookup on a page with no cached answers."""
+        assert cache.lookup("wiki_test", question_embedding, request_key=KEY) is None
+
+    def test_hit_for_similar_question(self, cache, question_embedding):
+        """Test a near-identical question returns the cached answer."""
+        cache.store("wiki_test", "What is Python?", question_embedding, "A language.", KEY)
+
+        paraphrase = np.asarray(question_embedding) + 0.01
+
+        assert cache.lookup("wiki_test", paraphrase.tolist(), request_key=KEY) == "A language."
+
+    def test_miss_for_different_question_or_request(self, cache, question_embedding):
+        """Test dissimilar questions and other models or parameters don't hit."""
+        cache.store("wiki_test", "What is Python?", question_embedding, "A language.", KEY)
+
+        opposite = (-np.asarray(question_embedding)).tolist()
+
+        assert cache.lookup("wiki_test", opposite, request_key=KEY) is None
+        for other in (
+            SemanticResponseCache.request_key("local-model", 0.2, 1000, 5, 0.89),
+            SemanticResponseCache.request_key("other-model", 0.7, 1000, 5, 0.89),
+            SemanticResponseCache.request_key("local-model", 0.7, 1000, 3, 0.89),
+        ):
+            assert cache.lookup("wiki_test", question_embedding, request_key=other) is None
+
+    def test_expired_and_invalidated(self, cache, question_embedding):
+        """Test expired entries are ignored and invalidate drops the page."""
+        cache.store("wiki_test", "What is Python?", question_embedding, "A language.", KEY)
+
+        cache.ttl_seconds = -1
+        assert cache.lookup("wiki_test", question_embedding, request_key=KEY) is None
+
+        cache.ttl_seconds = 60
+        cache.invalidate("wiki_test")
+        assert cache.lookup("wiki_test", question_embedding, request_key=KEY) is None
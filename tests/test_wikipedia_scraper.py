@@ -4,6 +4,7 @@ Tests for Wikipedia scraper functionality.
 
 import pytest
 
+from src.models.schemas import WikipediaPage
 from src.services.wikipedia_scraper import (
     PageNotFoundError,
     WikipediaScraper,
@@ -35,6 +36,55 @@ class TestWikipediaScraper:
         title = scraper._extract_title_from_identifier("Albert Einstein")
         assert title == "Albert Einstein"
 
+    def test_page_cache(self, monkeypatch):
+        """Test cached pages are served without the API, keyed by language and title."""
+        scraper = WikipediaScraper(language="en")
+        cached = WikipediaPage(
+            title="Cached Page",
+            url="https://en.wikipedia.org/wiki/Cached_Page",
+            summary="Cached summary.",
+            raw_content="Cached summary.",
+        )
+        monkeypatch.setattr(scraper, "wiki_api", None)  # any API call would fail
+
+        key = scraper._cache_key("Cached Page")
+
+        scraper._set_cached(scraper._page_cache, key, cached, scraper.PAGE_CACHE_SIZE)
+        try:
+            page = scraper.fetch("https://en.wikipedia.org/wiki/Cached_Page")
+
+            assert page == cached
+            assert page is not cached  # callers get their own copy
+            assert scraper._get_cached(scraper._page_cache, ("de", "Cached Page")) is None
+
+            # Entries older than the TTL are dropped
+            monkeypatch.setattr(WikipediaScraper, "CACHE_TTL_SECONDS", -1.0)
+            assert scraper._get_cached(scraper._page_cache, key) is None
+            assert key not in scraper._page_cache
+
+            scraper._set_cached(scraper._page_cache, key, cached, scraper.PAGE_CACHE_SIZE)
+            WikipediaScraper.clear_cache()
+            assert scraper._get_cached(scraper._page_cache, key) is None
+        finally:
+            WikipediaScraper.clear_cache()
+
+    def test_fetch_many_keeps_order(self, monkeypatch):
+        """Test concurrent fetching returns pages in identifier order."""
+        scraper = WikipediaScraper()
+
+        def fake_fetch(identifier):
+            return WikipediaPage(
+                title=identifier, url="https://test.com", summary="", raw_content=""
+            )
+
+        monkeypatch.setattr(scraper, "fetch", fake_fetch)
+
+        titles = [f"Page {n}" for n in range(10)]
+        pages = scraper.fetch_many(titles, max_workers=4)
+
+        assert [page.title for page in pages] == titles
+        assert scraper.fetch_many([]) == []
+
     def test_fetch_existing_page(self):
         """Test fetching a real Wikipedia page."""
         scraper = WikipediaScraper()